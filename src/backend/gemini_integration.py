@@ -4,259 +4,360 @@ Handles AI-powered cybersecurity question generation from ZAP scan data
 """
 
 from google import genai
+from google.genai import errors, types
+import asyncio
+import hashlib
+import httpx
 import json
+import orjson
 import os
 import logging
-from typing import List, Dict, Any, Optional
+import random
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, List, Dict, Any, Literal, Optional, Tuple
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+from response_cache import ResponseCache, create_response_cache
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
-# Sample ZAP data for testing
-SAMPLE_ZAP_DATA = """Missing Anti-clickjacking Header - Medium - https://webwriter.io/dashboard/
-Missing Anti-clickjacking Header - Medium - https://webwriter.io/
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/api/
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/admin/
-Information Disclosure - Suspicious Comments - Informational - https://webwriter.io/_next/static/chunks/684-9de7e8eb5c803a7c.js
-Re-examine Cache-control Directives - Informational - https://webwriter.io/robots.txt
-Re-examine Cache-control Directives - Informational - https://webwriter.io/sitemap.xml
-Modern Web Application - Informational - https://webwriter.io/admin/
-Retrieved from Cache - Informational - https://webwriter.io/_next/static/css/7c7af1ce1d610d49.css
-Retrieved from Cache - Informational - https://webwriter.io/_next/static/chunks/684-9de7e8eb5c803a7c.js
-Modern Web Application - Informational - https://webwriter.io/api/
-Re-examine Cache-control Directives - Informational - https://webwriter.io/dashboard/
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/sitemap.xml
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/684-9de7e8eb5c803a7c.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/css/7c7af1ce1d610d49.css
-Re-examine Cache-control Directives - Informational - https://webwriter.io/
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/robots.txt
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/admin/
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/dashboard/
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/api/
-Modern Web Application - Informational - https://webwriter.io/dashboard/
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/dashboard/
-Information Disclosure - Suspicious Comments - Informational - https://webwriter.io/
-Modern Web Application - Informational - https://webwriter.io/
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/dashboard/
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/admin/
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/css/7c7af1ce1d610d49.css
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/684-9de7e8eb5c803a7c.js
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/sitemap.xml
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/robots.txt
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/api/
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/dashboard/
-Information Disclosure - Suspicious Comments - Informational - https://webwriter.io/_next/static/chunks/640-d7450ef566d8d5b4.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/webpack-596a7359c2210d14.js
-Missing Anti-clickjacking Header - Medium - https://webwriter.io/terms
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/_next/static/
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/images/
-Retrieved from Cache - Informational - https://webwriter.io/_next/static/chunks/640-d7450ef566d8d5b4.js
-Missing Anti-clickjacking Header - Medium - https://webwriter.io/privacy
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/640-d7450ef566d8d5b4.js
-Modern Web Application - Informational - https://webwriter.io/_next/static/
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/webpack-596a7359c2210d14.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/640-d7450ef566d8d5b4.js
-Modern Web Application - Informational - https://webwriter.io/images/
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/_next/static/
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/images/
-Information Disclosure - Suspicious Comments - Informational - https://webwriter.io/_next/static/chunks/app/page-89801bf2fc80b6be.js
-Re-examine Cache-control Directives - Informational - https://webwriter.io/privacy
-Information Disclosure - Suspicious Comments - Informational - https://webwriter.io/_next/static/chunks/9da6db1e-cb64917ee3ab7dbb.js
-Re-examine Cache-control Directives - Informational - https://webwriter.io/terms
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/terms
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/privacy
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/images/
-Information Disclosure - Suspicious Comments - Informational - https://webwriter.io/_next/static/chunks/main-app-5e5e30756b95da64.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/media/b0088cce7ac0b424-s.p.woff2
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/privacy
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/terms
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/terms
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/privacy
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/terms
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/privacy
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/main-app-5e5e30756b95da64.js
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/media/b0088cce7ac0b424-s.p.woff2
-Retrieved from Cache - Informational - https://webwriter.io/_next/static/chunks/app/page-89801bf2fc80b6be.js
-Retrieved from Cache - Informational - https://webwriter.io/_next/static/chunks/9da6db1e-cb64917ee3ab7dbb.js
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/main-app-5e5e30756b95da64.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/app/page-89801bf2fc80b6be.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/9da6db1e-cb64917ee3ab7dbb.js
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/app/page-89801bf2fc80b6be.js
-Information Disclosure - Suspicious Comments - Informational - https://webwriter.io/_next/static/chunks/4bd1b696-015c8ee44a0e55b4.js
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Flogo.png&w=48&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Flogo.png&w=32&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Flogo.png&w=64
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/9da6db1e-cb64917ee3ab7dbb.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/app/dashboard/page-4d1c2ad6e41d811e.js
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Flogo.png&w=64
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Flogo.png&w=48&q=75
-Retrieved from Cache - Informational - https://webwriter.io/_next/static/chunks/4bd1b696-015c8ee44a0e55b4.js
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Flogo.png&w=32&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/app/dashboard/page-4d1c2ad6e41d811e.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/4bd1b696-015c8ee44a0e55b4.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Flogo.png&w=32&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Flogo.png&w=48&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/4bd1b696-015c8ee44a0e55b4.js
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Flogo.png&w=48&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Flogo.png&w=32&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Flogo.png&w=96&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Flogo.png&w=64&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Flogo.png&w=96&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Flogo.png&w=96&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Feditor.avif&w=640&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Flogo.png&w=96
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Flogo.png&w=96&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Flogo.png&w=64&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Feditor.avif&w=750&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Feditor.avif&w=640&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/120-7cc6b844b684e9bc.js
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Flogo.png&w=96
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Flogo.png&w=64&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/120-7cc6b844b684e9bc.js
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Flogo.png&w=64&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Feditor.avif&w=750&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Ffeather.png&w=64&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Feditor.avif&w=3840&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=750&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/favicon.ico
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Feditor.avif&w=2048&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=750&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Ffeather.png&w=64&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Feditor.avif&w=3840&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/favicon.ico
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=640&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Ffeather.png&w=64&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=3840&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=640&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Feditor.avif&w=1920&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Feditor.avif&w=2048&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=3840&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=2048&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Feditor.avif&w=1200&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=2048&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Ffeather.png&w=128
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Feditor.avif&w=1080&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Ffeather.png&w=64&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Feditor.avif&w=1920&q=75
-Information Disclosure - Suspicious Comments - Informational - https://webwriter.io/_next/static/chunks/polyfills-42372ed130431b0a.js
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Feditor.avif&w=1200&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Feditor.avif&w=1080&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Ffeather.png&w=128
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/static/chunks/polyfills-42372ed130431b0a.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=1920&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=1080&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Feditor.avif&w=828&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=1200&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Feditor.avif&w=3840
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=1920&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Feditor.avif&w=828&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/static/chunks/polyfills-42372ed130431b0a.js
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/cdn-cgi/l/email-protection
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/cdn-cgi/l/email-protection
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=1080&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=828&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=1200&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Ffeather.png&w=128&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Feditor.avif&w=828&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Ffeather.png&w=128&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Feditor.avif&w=3840
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/cdn-cgi/scripts/5c5dd728/cloudflare-static/email-decode.min.js
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Ffeather.png&w=128&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Flemon_squeezy.png&w=16&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Ffeather.png&w=128&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Fquestion_mark.png&w=64&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Fgolden_quill.png&w=128
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Flemon_squeezy.png&w=16&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Fgolden_quill.png&w=128
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Fquestion_mark.png&w=64&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Fgolden_wizard.png&w=96&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Flemon_squeezy.png&w=32&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Fgolden_wizard.png&w=256
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Fgolden_quill.png&w=64&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Fquestion_mark.png&w=64&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Flemon_squeezy.png&w=16&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Fgolden_quill.png&w=128&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Fgolden_wizard.png&w=256
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Fgolden_wizard.png&w=256&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Fquestion_mark.png&w=64&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Flemon_squeezy.png&w=16&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Flemon_squeezy.png&w=32&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Fgolden_wizard.png&w=96&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Fgolden_quill.png&w=128&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Fgolden_quill.png&w=64&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Fgolden_wizard.png&w=256&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Flemon_squeezy.png&w=32
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Flemon_squeezy.png&w=32&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Fgolden_quill.png&w=128&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Fgolden_wizard.png&w=256&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Fgolden_wizard.png&w=96&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Fgolden_quill.png&w=64&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Flemon_squeezy.png&w=32
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Fquestion_mark.png&w=128
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Fgolden_quill.png&w=128&q=75
-Content Security Policy (CSP) Header Not Set - Medium - https://webwriter.io/%2Fimages%2Fquestion_mark.png&w=128&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Fgolden_quill.png&w=64&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Fgolden_wizard.png&w=96&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Fgolden_wizard.png&w=256&q=75
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Fquestion_mark.png&w=128
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Flemon_squeezy.png&w=32&q=75
-Modern Web Application - Informational - https://webwriter.io/%2Fimages%2Fquestion_mark.png&w=128&q=75
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/%2Fimages%2Fquestion_mark.png&w=128&q=75
-Server Leaks Information via "X-Powered-By" HTTP Response Header Field(s) - Low - https://webwriter.io/%2Fimages%2Fquestion_mark.png&w=128&q=75
-Retrieved from Cache - Informational - https://webwriter.io/images/smallwizard.svg
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/images/smallwizard.svg
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/images/smallwizard.svg
-Retrieved from Cache - Informational - https://webwriter.io/images/dragon.svg
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/images/dragon.svg
-Retrieved from Cache - Informational - https://webwriter.io/images/potion.svg
-Strict-Transport-Security Header Not Set - Low - https://webwriter.io/images/potion.svg
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/images/dragon.svg
-X-Content-Type-Options Header Missing - Low - https://webwriter.io/images/potion.svg
-SQL Injection - SQLite (Time Based) - High - https://webwriter.io/_next/image?q=75&url=%2Fimages%2Fquestion_mark.png&w=128"""
+# Gemini request fan-out settings
+GEMINI_MODEL = "gemini-2.5-flash"
+QUESTIONS_PER_REQUEST = 5
+MAX_CONCURRENT_REQUESTS = int(os.getenv("GEMINI_MAX_CONCURRENCY", "10"))
+MAX_SCANS_PER_BATCH = 4
+
+# Gemini rate limiting and retry settings
+GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_RPM", "60"))
+GEMINI_MAX_ATTEMPTS = 5
+GEMINI_RETRY_BASE_DELAY = 1  # seconds
+GEMINI_RETRY_MAX_DELAY = 30  # seconds
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 503})
+# Transport failures that are worth retrying with the same backoff
+RETRYABLE_TRANSPORT_ERRORS = (httpx.TimeoutException, httpx.ConnectError, httpx.RemoteProtocolError)
+
+# Extra question requests made when duplicates leave a quiz short
+MAX_TOP_UP_ATTEMPTS = 2
+
+# Number of example URLs kept per unique alert when compressing ZAP data
+MAX_EXAMPLE_URLS = 3
+
+# Lookup tables and patterns used when sanitizing ZAP data
+# (control characters except tab, newline and carriage return are deleted)
+CONTROL_CHARS_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F]
+)
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+
+# Anything the sanitizer would change besides the final strip; clean input skips all passes
+NEEDS_SANITIZING_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F\r]|\n\s*\n')
+
+# Top-level fields of a full Gemini response
+RESPONSE_SECTIONS = ('exercises', 'vulnerability_guide')
+
+# Characters ignored when matching question vulnerability types to guide entry names
+VULN_NAME_NOISE_RE = re.compile(r'[^a-z0-9]+')
+
+# Markdown code fence Gemini sometimes wraps around its JSON output
+JSON_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```\s*$', re.DOTALL)
+
+# Static instructions shared by every request. Kept free of per-request values and
+# placed before the scan data so Gemini can reuse the cached prompt prefix.
+EXERCISE_TASK = """Create exactly the requested number of questions based on the vulnerabilities in the ZAP data. Only generate question types that have deterministic answers.
+
+Each question should be a JSON object with these fields:
+- vuln_type: the vulnerability name exactly as written in the ZAP data, without the severity or URLs
+- title: question title
+- short_explain: 1-2 sentence explanation
+- exercise_type: one of ["mcq", "fix_config", "sandbox"]
+- exercise_prompt: the actual question
+- choices: array of {id, text} for mcq/fix_config, empty array for sandbox
+- answer_key: array of correct answers (must match choice ids for mcq/fix_config, or exact expected output for sandbox)
+- hints: array of helpful hints
+- difficulty: "beginner", "intermediate", or "advanced"
+- xp: points awarded (50-300)
+- badge: achievement badge name
+"""
+
+EXERCISE_CONSTRAINTS = """- Ensure all answers are deterministic and unambiguous.
+- For mcq and fix_config, only one correct answer.
+- For sandbox, provide exact expected outputs (no subjective answers).
+- Do not generate any free-text or open-ended questions.
+"""
+
+GUIDE_TASK = """Create a vulnerability guide for each unique vulnerability type found in the ZAP data. Each guide entry should be a JSON object with these fields:
+- name: the vulnerability name exactly as written in the ZAP data, without the severity or URLs
+- severity: "Low", "Medium", "High", or "Critical"
+- category: vulnerability category (e.g., "Injection", "Security Headers", "Information Disclosure")
+- description: detailed explanation of the vulnerability
+- howItArises: array of ways this vulnerability can occur
+- exploitationMethods: array of attack techniques
+- realWorldExamples: array of actual attack examples/payloads
+- preventionMethods: array of security measures and fixes
+- codeExamples: object with "vulnerable" and "secure" code examples
+- relatedQuestions: empty array (it is filled in with the titles of the matching questions after generation)
+- quizAnswers: object containing general study facts about this vulnerability (not answers to specific questions)
+
+CRITICAL: The quizAnswers field should contain:
+- keyConcepts: array of 3-5 essential facts about this vulnerability that help users reason through questions about it
+- preventionMethods: array of 3-5 specific prevention techniques and security measures
+- securityHeaders: array of relevant security headers and their purposes (for header-related vulnerabilities only)
+- attackVectors: array of 2-3 common attack methods and payloads (for understanding what to prevent)
+"""
+
+GUIDE_CONSTRAINTS = """- The vulnerability guide should contain key concepts and building blocks that help users understand and piece together the answers.
+- Include specific prevention methods and security information that provide the knowledge needed to answer questions.
+- Make the guide a study resource where reading it provides the understanding to answer quiz questions.
+- The keyConcepts should contain essential facts that users can combine to find the correct answers.
+- Provide enough information that users can reason through the questions, but don't give direct answers.
+"""
+
+# Questions and the vulnerability guide are generated by separate, concurrent requests
+EXERCISE_PROMPT_PREFIX = """You are an expert cybersecurity tutor. I will give you ZAP scan results and you need to create cybersecurity training questions based on them. The number of questions to create and the ZAP scan data are given at the end of this prompt.
+
+""" + EXERCISE_TASK + """
+Constraints:
+""" + EXERCISE_CONSTRAINTS + """
+Return a JSON object with this structure:
+{
+  "exercises": [array of exactly the requested number of question objects]
+}
+
+"""
+
+GUIDE_PROMPT_PREFIX = """You are an expert cybersecurity tutor. I will give you ZAP scan results and you need to create a comprehensive vulnerability guide that learners study before answering cybersecurity training questions about them. The ZAP scan data is given at the end of this prompt.
+
+""" + GUIDE_TASK + """
+Constraints:
+""" + GUIDE_CONSTRAINTS + """
+Return a JSON object with this structure:
+{
+  "vulnerability_guide": [array of vulnerability guide objects]
+}
+
+"""
+
+# Per-request tails appended after the static prefixes; filled with %-formatting
+EXERCISE_PROMPT_SUFFIX_TEMPLATE = """Number of questions to create: %(num_questions)d
+%(shard_section)s
+Here is the ZAP scan data:
+%(zap_data)s
+
+Return ONLY the JSON object described above. No other text."""
+
+GUIDE_PROMPT_SUFFIX_TEMPLATE = """Here is the ZAP scan data:
+%(zap_data)s
+
+Return ONLY the JSON object described above. No other text."""
+
+# Prompt asking for several independent scans to be handled in one request
+BATCH_PROMPT_PREFIX = """You are an expert cybersecurity tutor. I will give you several separate ZAP scan results, each starting with a "=== SCAN <number> ===" line. For EACH scan, independently create cybersecurity training questions AND a comprehensive vulnerability guide, using only that scan's data. The number of scans, the number of questions per scan and the ZAP scan data are given at the end of this prompt.
+
+TASK 1: """ + EXERCISE_TASK + """
+TASK 2: """ + GUIDE_TASK + """
+IMPORTANT: Generate guide entries ONLY for vulnerabilities that will have corresponding quiz questions. Ensure 1:1 alignment between guide entries and question vulnerability types.
+
+Constraints:
+""" + EXERCISE_CONSTRAINTS + GUIDE_CONSTRAINTS + """
+Return a JSON array with exactly one object per scan, in the same order as the scans. Each object must have this structure:
+{
+  "exercises": [array of exactly the requested number of question objects],
+  "vulnerability_guide": [array of vulnerability guide objects]
+}
+
+"""
+
+BATCH_PROMPT_SUFFIX_TEMPLATE = """Number of scans: %(num_scans)d
+Number of questions to create for each scan: %(num_questions)d
+
+%(zap_data)s
+
+Return ONLY the JSON array described above, with exactly %(num_scans)d objects. No other text."""
+
+# Sample ZAP data for testing, loaded on demand
+SAMPLE_ZAP_DATA_PATH = Path(__file__).parent / "sample_zap_data.txt"
+
+@lru_cache(maxsize=1)
+def get_sample_zap_data() -> str:
+    """Load the bundled sample ZAP data used for testing"""
+    return SAMPLE_ZAP_DATA_PATH.read_text().strip()
 
 class ZAPDataRequest(BaseModel):
     """Request model for generating cybersecurity questions from ZAP data"""
     zap_data: str = Field(..., description="ZAP scan results as string")
     num_questions: int = Field(default=25, ge=1, le=50, description="Number of questions to generate (1-50)")
 
+class BatchZAPDataRequest(BaseModel):
+    """Request model for generating questions for several ZAP scans at once"""
+    zap_data_list: List[str] = Field(..., min_length=1, max_length=20, description="ZAP scan results, one string per scan")
+    num_questions: int = Field(default=5, ge=1, le=50, description="Number of questions to generate per scan (1-50)")
+
 class GameResponse(BaseModel):
     """Response model for generated cybersecurity questions"""
     exercises: List[Dict[str, Any]] = Field(..., description="List of generated questions")
     total_questions: int = Field(..., description="Total number of questions generated")
     vulnerability_guide: List[Dict[str, Any]] = Field(..., description="Relevant vulnerability explanations for the detected vulnerabilities")
 
+class ExerciseChoice(BaseModel):
+    """Answer option for mcq and fix_config exercises"""
+    id: str
+    text: str
+
+class CodeExamples(BaseModel):
+    """Vulnerable and secure code samples for a guide entry"""
+    vulnerable: str
+    secure: str
+
+class QuizAnswers(BaseModel):
+    """Study material that helps users answer quiz questions"""
+    keyConcepts: List[str]
+    preventionMethods: List[str]
+    securityHeaders: List[str]
+    attackVectors: List[str]
+
+class Exercise(BaseModel):
+    """Response schema for a single generated question"""
+    vuln_type: str
+    title: str
+    short_explain: str
+    exercise_type: Literal["mcq", "fix_config", "sandbox"]
+    exercise_prompt: str
+    choices: List[ExerciseChoice]
+    answer_key: List[str]
+    hints: List[str]
+    difficulty: Literal["beginner", "intermediate", "advanced"]
+    xp: int
+    badge: str
+
+class VulnerabilityGuideEntry(BaseModel):
+    """Response schema for a single vulnerability guide entry"""
+    name: str
+    severity: Literal["Low", "Medium", "High", "Critical"]
+    category: str
+    description: str
+    howItArises: List[str]
+    exploitationMethods: List[str]
+    realWorldExamples: List[str]
+    preventionMethods: List[str]
+    codeExamples: CodeExamples
+    relatedQuestions: List[str]
+    quizAnswers: QuizAnswers
+
+class GeneratedQuestions(BaseModel):
+    """Response schema Gemini must follow for one scan"""
+    exercises: List[Exercise]
+    vulnerability_guide: List[VulnerabilityGuideEntry]
+
+class GeneratedExercises(BaseModel):
+    """Response schema for a questions-only request"""
+    exercises: List[Exercise]
+
+class GeneratedGuide(BaseModel):
+    """Response schema for a vulnerability-guide-only request"""
+    vulnerability_guide: List[VulnerabilityGuideEntry]
+
+class AsyncTokenBucket:
+    """Token-bucket limiter that paces coroutines to a requests-per-minute budget"""
+    
+    def __init__(self, requests_per_minute: int):
+        self.capacity = float(requests_per_minute)
+        self.tokens = float(requests_per_minute)
+        self.fill_rate = requests_per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+
 class GeminiIntegration:
     """Handles Gemini AI integration for cybersecurity question generation"""
     
-    def __init__(self):
+    # Response validation rules
+    REQUIRED_EXERCISE_FIELDS = frozenset({
+        'vuln_type', 'title', 'short_explain', 'exercise_type',
+        'exercise_prompt', 'choices', 'answer_key', 'hints',
+        'difficulty', 'xp', 'badge'
+    })
+    VALID_EXERCISE_TYPES = frozenset({'mcq', 'fix_config', 'sandbox'})
+    SINGLE_ANSWER_EXERCISE_TYPES = frozenset({'mcq', 'fix_config'})
+    REQUIRED_GUIDE_FIELDS = frozenset({
+        'name', 'severity', 'category', 'description',
+        'howItArises', 'exploitationMethods', 'realWorldExamples',
+        'preventionMethods', 'codeExamples', 'relatedQuestions', 'quizAnswers'
+    })
+    
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        rate_limit: int = GEMINI_REQUESTS_PER_MINUTE,
+        cache: Optional[ResponseCache] = None
+    ):
         self.client = None
+        self._api_key_present = False
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate_limiter = AsyncTokenBucket(rate_limit)
+        self._cache = cache if cache is not None else create_response_cache()
+        self._in_flight: Dict[str, asyncio.Task] = {}
         self._initialize_client()
     
     def _initialize_client(self):
         """Initialize the Gemini client"""
         try:
-            if not os.getenv("GEMINI_API_KEY"):
+            self._api_key_present = bool(os.getenv("GEMINI_API_KEY"))
+            if not self._api_key_present:
                 logger.warning("GEMINI_API_KEY not found in environment variables")
                 return
             
-            self.client = genai.Client()
+            # Keep enough warm connections for every concurrent chunked request
+            self.client = genai.Client(
+                http_options=types.HttpOptions(
+                    async_client_args={
+                        'limits': httpx.Limits(
+                            max_connections=self.max_concurrency,
+                            max_keepalive_connections=self.max_concurrency
+                        )
+                    }
+                )
+            )
             logger.info("Gemini client initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize Gemini client: {str(e)}")
+            logger.error("Failed to initialize Gemini client: %s", e)
             self.client = None
     
+    async def warm_up(self) -> None:
+        """Open the Gemini connection pool ahead of the first request"""
+        if not self.is_available():
+            return
+        
+        try:
+            # A model metadata lookup completes the TLS handshake without spending tokens
+            await self.client.aio.models.get(model=GEMINI_MODEL)
+            logger.info("Gemini connection pool warmed up")
+        except Exception as e:
+            logger.warning("Failed to warm up Gemini connection: %s", e)
+    
     def is_available(self) -> bool:
         """Check if Gemini API is available and configured"""
-        return self.client is not None and os.getenv("GEMINI_API_KEY") is not None
+        return self.client is not None and self._api_key_present
     
     async def generate_cybersec_questions(self, zap_data: str, num_questions: int = 25) -> GameResponse:
         """
@@ -275,196 +376,584 @@ class GeminiIntegration:
         if not self.is_available():
             raise Exception("Gemini API is not available. Please check GEMINI_API_KEY environment variable.")
         
+        sanitized_zap_data = self._prepare_zap_data(zap_data)
+        
+        cache_key = self._cache_key(sanitized_zap_data, num_questions)
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Returning cached questions for identical ZAP data")
+            return GameResponse.model_construct(**cached)
+        
+        # Piggy-back on an identical request that is already running
+        task = self._in_flight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_uncached(sanitized_zap_data, num_questions, cache_key))
+            self._in_flight[cache_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+        
+        return await asyncio.shield(task)
+    
+    async def generate_cybersec_questions_batch(self, zap_data_list: List[str], num_questions: int = QUESTIONS_PER_REQUEST) -> List[GameResponse]:
+        """
+        Generate cybersecurity training questions for several ZAP scans
+        
+        Small jobs share Gemini requests (up to MAX_SCANS_PER_BATCH scans per
+        prompt) so several queued scans cost one API call instead of one each.
+        
+        Args:
+            zap_data_list: ZAP scan results, one string per scan
+            num_questions: Number of questions to generate per scan
+            
+        Returns:
+            One GameResponse per scan, in input order
+            
+        Raises:
+            Exception: If generation fails
+        """
+        if not self.is_available():
+            raise Exception("Gemini API is not available. Please check GEMINI_API_KEY environment variable.")
+        
+        if num_questions > QUESTIONS_PER_REQUEST:
+            # Large jobs already fan out into chunked requests, so run them concurrently instead
+            return list(await asyncio.gather(*[
+                self.generate_cybersec_questions(zap_data, num_questions) for zap_data in zap_data_list
+            ]))
+        
+        prepared = [self._prepare_zap_data(zap_data) for zap_data in zap_data_list]
+        cache_keys = [self._cache_key(zap_data, num_questions) for zap_data in prepared]
+        results: List[Optional[GameResponse]] = [None] * len(prepared)
+        
+        pending = []
+        for index, cache_key in enumerate(cache_keys):
+            cached = await self._cache.get(cache_key)
+            if cached is not None:
+                results[index] = GameResponse.model_construct(**cached)
+            else:
+                pending.append(index)
+        
+        batches = [pending[i:i + MAX_SCANS_PER_BATCH] for i in range(0, len(pending), MAX_SCANS_PER_BATCH)]
+        
+        try:
+            logger.info("Generating questions for %d ZAP scans across %d batched requests", len(pending), len(batches))
+            batch_responses = await asyncio.gather(*[
+                self._generate_batch([prepared[index] for index in batch], num_questions) for batch in batches
+            ])
+        except Exception as e:
+            logger.error("Failed to generate batched questions: %s", e)
+            raise Exception(f"Failed to generate questions: {str(e)}")
+        
+        for batch, responses in zip(batches, batch_responses):
+            for index, response_data in zip(batch, responses):
+                exercises, vulnerability_guide = self._merge_responses([response_data])
+                exercises = exercises[:num_questions]
+                vulnerability_guide = self._align_guide(exercises, vulnerability_guide)
+                result = GameResponse.model_construct(
+                    exercises=exercises,
+                    total_questions=len(exercises),
+                    vulnerability_guide=vulnerability_guide
+                )
+                await self._cache.set(cache_keys[index], result.model_dump())
+                results[index] = result
+        
+        return results
+    
+    async def _generate_batch(self, prepared_zap_data: List[str], num_questions: int) -> List[Dict[str, Any]]:
+        """Run one Gemini request covering several scans and parse the per-scan responses"""
+        prompt = self._build_batch_prompt(prepared_zap_data, num_questions)
+        response_text = await self._complete_with_retries(prompt, List[GeneratedQuestions])
+        return self._parse_batch_response(response_text, len(prepared_zap_data))
+    
+    async def stream_cybersec_questions(self, zap_data: str, num_questions: int = 25) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate cybersecurity training questions, yielding each batch as soon as it is ready
+        
+        Args:
+            zap_data: ZAP scan results as string
+            num_questions: Number of questions to generate
+            
+        Yields:
+            Dicts with the newly generated 'exercises', followed by a final dict
+            carrying the 'vulnerability_guide' entries that match them
+            
+        Raises:
+            Exception: If generation fails
+        """
+        if not self.is_available():
+            raise Exception("Gemini API is not available. Please check GEMINI_API_KEY environment variable.")
+        
+        sanitized_zap_data = self._prepare_zap_data(zap_data)
+        
+        cache_key = self._cache_key(sanitized_zap_data, num_questions)
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Streaming cached questions for identical ZAP data")
+            yield {
+                "exercises": cached["exercises"],
+                "vulnerability_guide": cached["vulnerability_guide"]
+            }
+            return
+        
+        requests = self._build_exercise_prompts(sanitized_zap_data, num_questions)
+        logger.info("Streaming %d cybersecurity questions from ZAP data across %d requests plus a vulnerability guide request", num_questions, len(requests))
+        tasks = [asyncio.ensure_future(self._generate_exercises(prompt)) for prompt, _ in requests]
+        tasks.append(asyncio.ensure_future(self._get_vulnerability_guide(sanitized_zap_data)))
+        
+        responses = []
+        sent_exercises = 0
+        try:
+            # Emit each chunk's new questions in completion order
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    responses.append(await next_done)
+                except Exception as e:
+                    logger.error("Failed to generate questions: %s", e)
+                    raise Exception(f"Failed to generate questions: {str(e)}")
+                
+                exercises, vulnerability_guide = self._merge_responses(responses)
+                exercises = exercises[:num_questions]
+                if len(exercises) > sent_exercises:
+                    yield {"exercises": exercises[sent_exercises:], "vulnerability_guide": []}
+                    sent_exercises = len(exercises)
+        finally:
+            # Stop outstanding requests if the client disconnects or a chunk fails
+            for task in tasks:
+                task.cancel()
+        
+        if len(exercises) < num_questions:
+            try:
+                exercises, vulnerability_guide = await self._top_up_responses(sanitized_zap_data, responses, num_questions)
+            except Exception as e:
+                logger.error("Failed to generate questions: %s", e)
+                raise Exception(f"Failed to generate questions: {str(e)}")
+            exercises = exercises[:num_questions]
+            if len(exercises) > sent_exercises:
+                yield {"exercises": exercises[sent_exercises:], "vulnerability_guide": []}
+        
+        # Guide entries are only final once every question is known
+        vulnerability_guide = self._align_guide(exercises, vulnerability_guide)
+        yield {"exercises": [], "vulnerability_guide": vulnerability_guide}
+        
+        await self._cache.set(cache_key, {
+            "exercises": exercises,
+            "total_questions": len(exercises),
+            "vulnerability_guide": vulnerability_guide
+        })
+    
+    def _prepare_zap_data(self, zap_data: str) -> str:
+        """Sanitize and compress raw ZAP data before prompting"""
         # Sanitize the ZAP data to remove control characters
         sanitized_zap_data = self._sanitize_zap_data(zap_data)
-        prompt = self._build_prompt(sanitized_zap_data, num_questions)
+        
+        # Collapse repeated alerts so the prompt only carries one line per vulnerability
+        return self._compress_zap_data(sanitized_zap_data)
+    
+    def _build_exercise_prompts(self, sanitized_zap_data: str, num_questions: int) -> List[Tuple[str, int]]:
+        """Split the questions into smaller (prompt, question count) requests that run concurrently"""
+        chunk_sizes = self._split_question_count(num_questions)
+        return [
+            (self._build_exercise_prompt(sanitized_zap_data, size, self._build_shard_hint(index, len(chunk_sizes))), size)
+            for index, size in enumerate(chunk_sizes)
+        ]
+    
+    async def _generate_uncached(self, sanitized_zap_data: str, num_questions: int, cache_key: str) -> GameResponse:
+        """Generate questions from Gemini and store the result in the response cache"""
+        requests = self._build_exercise_prompts(sanitized_zap_data, num_questions)
         
         try:
-            logger.info(f"Generating {num_questions} cybersecurity questions and vulnerability guide from ZAP data")
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash",
-                contents=prompt
-            )
+            # The guide does not depend on the questions, so it is generated alongside them
+            logger.info("Generating %d cybersecurity questions from ZAP data across %d requests plus a vulnerability guide request", num_questions, len(requests))
+            responses = list(await asyncio.gather(
+                *[self._generate_exercises(prompt) for prompt, _ in requests],
+                self._get_vulnerability_guide(sanitized_zap_data)
+            ))
             
-            # Clean and parse the response
-            response_data = self._parse_response(response.text, num_questions)
-            exercises = response_data['exercises']
-            vulnerability_guide = response_data['vulnerability_guide']
+            exercises, vulnerability_guide = await self._top_up_responses(sanitized_zap_data, responses, num_questions)
+            exercises = exercises[:num_questions]
+            vulnerability_guide = self._align_guide(exercises, vulnerability_guide)
             
-            logger.info(f"Successfully generated {len(exercises)} questions and {len(vulnerability_guide)} vulnerability guide entries")
-            return GameResponse(
+            logger.debug("Successfully generated %d questions and %d vulnerability guide entries", len(exercises), len(vulnerability_guide))
+            # _parse_response already validated every entry, so skip pydantic re-validation
+            result = GameResponse.model_construct(
                 exercises=exercises,
                 total_questions=len(exercises),
                 vulnerability_guide=vulnerability_guide
             )
+            await self._cache.set(cache_key, result.model_dump())
+            return result
             
         except Exception as e:
-            logger.error(f"Failed to generate questions: {str(e)}")
+            logger.error("Failed to generate questions: %s", e)
             raise Exception(f"Failed to generate questions: {str(e)}")
     
+    async def _top_up_responses(
+        self,
+        sanitized_zap_data: str,
+        responses: List[Dict[str, Any]],
+        num_questions: int
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Merge the responses, requesting more questions while duplicates leave fewer than requested"""
+        exercises, vulnerability_guide = self._merge_responses(responses)
+        
+        for attempt in range(1, MAX_TOP_UP_ATTEMPTS + 1):
+            shortfall = num_questions - len(exercises)
+            if shortfall <= 0:
+                return exercises, vulnerability_guide
+            
+            logger.warning("Only %d of %d questions left after removing duplicates, requesting %d more (attempt %d/%d)", len(exercises), num_questions, shortfall, attempt, MAX_TOP_UP_ATTEMPTS)
+            avoid_hint = self._build_avoid_hint(exercises)
+            responses.extend(await asyncio.gather(*[
+                self._generate_exercises(self._build_exercise_prompt(sanitized_zap_data, size, avoid_hint))
+                for size in self._split_question_count(shortfall)
+            ]))
+            exercises, vulnerability_guide = self._merge_responses(responses)
+        
+        if len(exercises) < num_questions:
+            logger.warning("Returning %d of %d requested questions after %d top-up attempts", len(exercises), num_questions, MAX_TOP_UP_ATTEMPTS)
+        return exercises, vulnerability_guide
+    
+    def _cache_key(self, sanitized_zap_data: str, num_questions: int) -> str:
+        """Build the response cache key from the model, question count and sanitized ZAP data"""
+        return hashlib.sha256(f"{GEMINI_MODEL}:{num_questions}:{sanitized_zap_data}".encode()).hexdigest()
+    
+    async def _get_vulnerability_guide(self, sanitized_zap_data: str) -> Dict[str, Any]:
+        """Return the guide for the scan's vulnerability types, generating it only on a cache miss"""
+        vulnerability_types = self._extract_vulnerability_types(sanitized_zap_data)
+        
+        # The guide depends only on which vulnerabilities were found, not on the affected URLs
+        cache_key = self._guide_cache_key(vulnerability_types)
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Returning cached vulnerability guide for %d vulnerability types", len(vulnerability_types))
+            return cached
+        
+        response_data = await self._generate_guide(self._build_guide_prompt("\n".join(vulnerability_types)))
+        await self._cache.set(cache_key, response_data)
+        return response_data
+    
+    def _guide_cache_key(self, vulnerability_types: List[str]) -> str:
+        """Build the guide cache key from the model and the sorted vulnerability types"""
+        joined_types = "\n".join(vulnerability_types)
+        return hashlib.sha256(f"{GEMINI_MODEL}:guide:{joined_types}".encode()).hexdigest()
+    
+    async def _generate_exercises(self, prompt: str) -> Dict[str, Any]:
+        """Run a single questions request with retries and parse its response"""
+        response_text = await self._complete_with_retries(prompt, GeneratedExercises)
+        return self._parse_response(response_text, ('exercises',))
+    
+    async def _generate_guide(self, prompt: str) -> Dict[str, Any]:
+        """Run a single vulnerability guide request with retries and parse its response"""
+        response_text = await self._complete_with_retries(prompt, GeneratedGuide)
+        return self._parse_response(response_text, ('vulnerability_guide',))
+    
+    async def _complete_with_retries(self, prompt: str, response_schema: Any) -> str:
+        """Run a single Gemini completion, retrying on throttling and transient errors"""
+        for attempt in range(1, GEMINI_MAX_ATTEMPTS + 1):
+            try:
+                response_text = await self._stream_completion(prompt, response_schema)
+                break
+            except (errors.APIError, *RETRYABLE_TRANSPORT_ERRORS) as e:
+                if isinstance(e, errors.APIError):
+                    retryable = e.code in RETRYABLE_STATUS_CODES
+                    reason = f"status {e.code}"
+                else:
+                    retryable = True
+                    reason = type(e).__name__
+                if not retryable or attempt == GEMINI_MAX_ATTEMPTS:
+                    raise
+                
+                # Exponential backoff with jitter so parallel chunks don't retry in lockstep
+                delay = min(GEMINI_RETRY_MAX_DELAY, GEMINI_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                delay += random.uniform(0, GEMINI_RETRY_BASE_DELAY)
+                logger.warning("Gemini request failed with %s (attempt %d/%d), retrying in %.1fs", reason, attempt, GEMINI_MAX_ATTEMPTS, delay)
+                await asyncio.sleep(delay)
+        
+        return response_text
+    
+    async def _stream_completion(self, prompt: str, response_schema: Any) -> str:
+        """Stream a single JSON-constrained Gemini completion and return its full text"""
+        chunks = []
+        checked_start = False
+        async with self._semaphore:
+            await self._rate_limiter.acquire()
+            stream = await self.client.aio.models.generate_content_stream(
+                model=GEMINI_MODEL,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=response_schema
+                )
+            )
+            async for chunk in stream:
+                text = chunk.text
+                if not text:
+                    continue
+                chunks.append(text)
+                
+                # Abort early instead of waiting for a full response that can never parse
+                if not checked_start and text.strip():
+                    checked_start = True
+                    if not text.lstrip().startswith(('{', '[', '```')):
+                        raise ValueError(f"Gemini response is not JSON: {text[:100]}")
+        
+        return "".join(chunks)
+    
+    def _split_question_count(self, num_questions: int) -> List[int]:
+        """Split the requested question count into per-request chunk sizes"""
+        full_chunks, remainder = divmod(num_questions, QUESTIONS_PER_REQUEST)
+        chunk_sizes = [QUESTIONS_PER_REQUEST] * full_chunks
+        if remainder:
+            chunk_sizes.append(remainder)
+        return chunk_sizes
+    
+    def _build_shard_hint(self, shard_index: int, shard_count: int) -> Optional[str]:
+        """Describe which slice of the vulnerability list a chunked request should focus on"""
+        if shard_count <= 1:
+            return None
+        return (
+            f"This is request {shard_index + 1} of {shard_count} running in parallel. "
+            f"Split the unique vulnerability types in the scan data into {shard_count} roughly equal groups "
+            f"in the order they first appear, and focus your questions on group {shard_index + 1} so that "
+            f"other requests do not repeat the same questions."
+        )
+    
+    def _build_avoid_hint(self, exercises: List[Dict[str, Any]]) -> str:
+        """List the question titles a top-up request must not repeat"""
+        titles = "\n".join(f"- {exercise['title']}" for exercise in exercises)
+        return f"These questions already exist, so create different ones and do not repeat their titles:\n{titles}"
+    
+    def _merge_responses(self, responses: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Combine chunked responses, dropping duplicate questions and guide entries"""
+        exercises = []
+        vulnerability_guide = []
+        seen_exercises = set()
+        seen_guides = set()
+        
+        for response_data in responses:
+            for exercise in response_data['exercises']:
+                key = (exercise['vuln_type'], exercise['title'])
+                if key not in seen_exercises:
+                    seen_exercises.add(key)
+                    exercises.append(exercise)
+            for guide_entry in response_data['vulnerability_guide']:
+                name = guide_entry['name']
+                if name not in seen_guides:
+                    seen_guides.add(name)
+                    vulnerability_guide.append(guide_entry)
+        
+        return exercises, vulnerability_guide
+    
+    def _align_guide(self, exercises: List[Dict[str, Any]], vulnerability_guide: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill each guide entry's relatedQuestions from the questions, dropping entries no question covers"""
+        question_types = [
+            (VULN_NAME_NOISE_RE.sub('', exercise['vuln_type'].lower()), exercise['title'])
+            for exercise in exercises
+        ]
+        
+        aligned = []
+        for guide_entry in vulnerability_guide:
+            name = VULN_NAME_NOISE_RE.sub('', guide_entry['name'].lower())
+            # Names may differ in suffixes such as the severity, so either may contain the other
+            related = [
+                title for vuln_type, title in question_types
+                if vuln_type and name and (vuln_type in name or name in vuln_type)
+            ]
+            if related:
+                # Copy the entry so cached guide responses are never modified
+                aligned.append({**guide_entry, 'relatedQuestions': related})
+        
+        return aligned
+    
     def _sanitize_zap_data(self, zap_data: str) -> str:
         """Sanitize ZAP data by removing control characters and normalizing whitespace"""
-        import re
+        # Fast path for the common case of already-clean ZAP output
+        if not NEEDS_SANITIZING_RE.search(zap_data):
+            return zap_data.strip()
         
         # Remove control characters except newlines and tabs
-        sanitized = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', zap_data)
+        sanitized = zap_data.translate(CONTROL_CHARS_TABLE)
         
         # Normalize line endings
         sanitized = sanitized.replace('\r\n', '\n').replace('\r', '\n')
         
         # Remove excessive whitespace
-        sanitized = re.sub(r'\n\s*\n', '\n', sanitized)
+        sanitized = BLANK_LINES_RE.sub('\n', sanitized)
         
         # Strip leading/trailing whitespace
         sanitized = sanitized.strip()
         
         return sanitized
     
-    def _build_prompt(self, zap_data: str, num_questions: int) -> str:
-        """Build the prompt for Gemini API"""
-        return f"""You are an expert cybersecurity tutor. I will give you ZAP scan results and you need to create {num_questions} different cybersecurity training questions AND a comprehensive vulnerability guide.
-
-Here is the ZAP scan data:
-{zap_data}
-
-TASK 1: Create exactly {num_questions} questions based on these vulnerabilities. Only generate question types that have deterministic answers.
-
-Each question should be a JSON object with these fields:
-- vuln_type: short vulnerability identifier
-- title: question title
-- short_explain: 1-2 sentence explanation
-- exercise_type: one of ["mcq", "fix_config", "sandbox"]
-- exercise_prompt: the actual question
-- choices: array of {{id, text}} for mcq/fix_config, empty array for sandbox
-- answer_key: array of correct answers (must match choice ids for mcq/fix_config, or exact expected output for sandbox)
-- hints: array of helpful hints
-- difficulty: "beginner", "intermediate", or "advanced"
-- xp: points awarded (50-300)
-- badge: achievement badge name
-
-TASK 2: Create a vulnerability guide for each unique vulnerability type found in the ZAP data. Each guide entry should be a JSON object with these fields:
-- name: vulnerability name
-- severity: "Low", "Medium", "High", or "Critical"
-- category: vulnerability category (e.g., "Injection", "Security Headers", "Information Disclosure")
-- description: detailed explanation of the vulnerability
-- howItArises: array of ways this vulnerability can occur
-- exploitationMethods: array of attack techniques
-- realWorldExamples: array of actual attack examples/payloads
-- preventionMethods: array of security measures and fixes
-- codeExamples: object with "vulnerable" and "secure" code examples
-- relatedQuestions: array of question titles that relate to this vulnerability
-- quizAnswers: object containing direct answers to quiz questions about this vulnerability
-
-CRITICAL: The quizAnswers field should contain:
-- keyConcepts: array of 3-5 essential facts that help users understand and piece together the answers to quiz questions
-- preventionMethods: array of 3-5 specific prevention techniques and security measures
-- securityHeaders: array of relevant security headers and their purposes (for header-related vulnerabilities only)
-- attackVectors: array of 2-3 common attack methods and payloads (for understanding what to prevent)
-
-IMPORTANT: Generate guide entries ONLY for vulnerabilities that will have corresponding quiz questions. Ensure 1:1 alignment between guide entries and question vulnerability types.
-
-Constraints:
-- Ensure all answers are deterministic and unambiguous.
-- For mcq and fix_config, only one correct answer.
-- For sandbox, provide exact expected outputs (no subjective answers).
-- Do not generate any free-text or open-ended questions.
-- The vulnerability guide should contain key concepts and building blocks that help users understand and piece together the answers.
-- Include specific prevention methods and security information that provide the knowledge needed to answer questions.
-- Make the guide a study resource where reading it provides the understanding to answer quiz questions.
-- The keyConcepts should contain essential facts that users can combine to find the correct answers.
-- Provide enough information that users can reason through the questions, but don't give direct answers.
-
-Return a JSON object with this structure:
-{{
-  "exercises": [array of {num_questions} question objects],
-  "vulnerability_guide": [array of vulnerability guide objects]
-}}
-
-Return ONLY this JSON object. No other text."""
+    def _compress_zap_data(self, zap_data: str) -> str:
+        """Group 'alert - severity - url' lines into one line per (alert, severity) pair"""
+        grouped: Dict[Tuple[str, str], List[str]] = {}
+        order: List[Any] = []
+        
+        for line in zap_data.split('\n'):
+            parts = line.rsplit(' - ', 2)
+            if len(parts) != 3:
+                # Keep lines that don't follow the ZAP format untouched
+                order.append(line)
+                continue
+            
+            alert, severity, url = (part.strip() for part in parts)
+            key = (alert, severity)
+            if key not in grouped:
+                grouped[key] = []
+                order.append(key)
+            grouped[key].append(url)
+        
+        compressed = []
+        for entry in order:
+            if isinstance(entry, str):
+                compressed.append(entry)
+                continue
+            
+            urls = grouped[entry]
+            alert, severity = entry
+            if len(urls) == 1:
+                compressed.append(f"{alert} - {severity} - {urls[0]}")
+            else:
+                examples = ", ".join(urls[:MAX_EXAMPLE_URLS])
+                compressed.append(f"{alert} - {severity} - {len(urls)} URLs (examples: {examples})")
+        
+        return "\n".join(compressed)
+    
+    def _extract_vulnerability_types(self, zap_data: str) -> List[str]:
+        """Reduce compressed ZAP data to its sorted, unique 'alert - severity' entries"""
+        vulnerability_types = set()
+        for line in zap_data.split('\n'):
+            parts = line.rsplit(' - ', 2)
+            if len(parts) == 3:
+                alert, severity, _ = parts
+                vulnerability_types.add(f"{alert} - {severity}")
+            elif line.strip():
+                vulnerability_types.add(line.strip())
+        
+        return sorted(vulnerability_types)
+    
+    def _build_exercise_prompt(self, zap_data: str, num_questions: int, shard_hint: Optional[str] = None) -> str:
+        """Build the questions prompt for Gemini API"""
+        return "".join((EXERCISE_PROMPT_PREFIX, EXERCISE_PROMPT_SUFFIX_TEMPLATE % {
+            'num_questions': num_questions,
+            'zap_data': zap_data,
+            'shard_section': f"{shard_hint}\n" if shard_hint else "",
+        }))
+    
+    def _build_guide_prompt(self, zap_data: str) -> str:
+        """Build the vulnerability guide prompt for Gemini API"""
+        return "".join((GUIDE_PROMPT_PREFIX, GUIDE_PROMPT_SUFFIX_TEMPLATE % {'zap_data': zap_data}))
+    
+    def _build_batch_prompt(self, zap_data_list: List[str], num_questions: int) -> str:
+        """Build a single prompt covering several ZAP scans"""
+        scans = "\n\n".join(
+            f"=== SCAN {index} ===\n{zap_data}" for index, zap_data in enumerate(zap_data_list, 1)
+        )
+        return "".join((BATCH_PROMPT_PREFIX, BATCH_PROMPT_SUFFIX_TEMPLATE % {
+            'num_scans': len(zap_data_list),
+            'num_questions': num_questions,
+            'zap_data': scans,
+        }))
+    
+    def _load_response_json(self, response_text: str) -> Any:
+        """Strip markdown fences from a Gemini response and decode its JSON"""
+        # Capture the fenced body in one pass instead of substituting and stripping
+        fence_match = JSON_FENCE_RE.match(response_text)
+        json_text = fence_match.group(1) if fence_match else response_text.strip()
+        
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(json_text.encode())
     
-    def _parse_response(self, response_text: str, expected_count: int) -> Dict[str, Any]:
+    def _parse_response(self, response_text: str, sections: Tuple[str, ...] = RESPONSE_SECTIONS) -> Dict[str, Any]:
         """Parse and clean the Gemini response"""
         try:
-            # Clean the response text
-            json_text = response_text.strip()
-            if json_text.startswith('```json'):
-                json_text = json_text.replace('```json', '').replace('```', '').strip()
-            elif json_text.startswith('```'):
-                json_text = json_text.replace('```', '').strip()
+            response_data = self._load_response_json(response_text)
+            return self._validate_response_data(response_data, sections)
             
-            # Parse JSON
-            response_data = json.loads(json_text)
-            
-            # Validate that we got the expected structure
-            if not isinstance(response_data, dict):
-                raise ValueError("Response is not a dictionary")
-            
-            if 'exercises' not in response_data or 'vulnerability_guide' not in response_data:
-                raise ValueError("Response missing 'exercises' or 'vulnerability_guide' fields")
-            
-            exercises = response_data['exercises']
-            vulnerability_guide = response_data['vulnerability_guide']
-            
-            # Validate exercises
-            if not isinstance(exercises, list):
-                raise ValueError("Exercises is not a list")
-            
-            # Validate each exercise has required fields
-            required_exercise_fields = [
-                'vuln_type', 'title', 'short_explain', 'exercise_type',
-                'exercise_prompt', 'choices', 'answer_key', 'hints',
-                'difficulty', 'xp', 'badge'
-            ]
-            
-            # Validate exercise types
-            valid_exercise_types = ['mcq', 'fix_config', 'sandbox']
-            
-            for i, exercise in enumerate(exercises):
-                if not isinstance(exercise, dict):
-                    raise ValueError(f"Exercise {i} is not a dictionary")
-                
-                for field in required_exercise_fields:
-                    if field not in exercise:
-                        raise ValueError(f"Exercise {i} missing required field: {field}")
-                
-                # Validate exercise type
-                if exercise['exercise_type'] not in valid_exercise_types:
-                    raise ValueError(f"Exercise {i} has invalid exercise_type: {exercise['exercise_type']}. Must be one of {valid_exercise_types}")
-                
-                # Validate answer_key has only one answer for mcq and fix_config
-                if exercise['exercise_type'] in ['mcq', 'fix_config']:
-                    if not isinstance(exercise['answer_key'], list) or len(exercise['answer_key']) != 1:
-                        raise ValueError(f"Exercise {i} ({exercise['exercise_type']}) must have exactly one answer in answer_key array")
-            
-            # Validate vulnerability guide
-            if not isinstance(vulnerability_guide, list):
-                raise ValueError("Vulnerability guide is not a list")
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse JSON response: %s", e)
+            logger.error("Response text (first 500 chars): %s", response_text[:500])
+            raise Exception(f"Invalid JSON response from Gemini: {str(e)}")
+        except Exception as e:
+            logger.error("Failed to parse response: %s", e)
+            logger.error("Response text (first 500 chars): %s", response_text[:500])
+            raise Exception(f"Failed to parse response: {str(e)}")
+    
+    def _parse_batch_response(self, response_text: str, expected_scans: int) -> List[Dict[str, Any]]:
+        """Parse a batched Gemini response into one validated response per scan"""
+        try:
+            batch_data = self._load_response_json(response_text)
             
-            required_guide_fields = [
-                'name', 'severity', 'category', 'description',
-                'howItArises', 'exploitationMethods', 'realWorldExamples',
-                'preventionMethods', 'codeExamples', 'relatedQuestions', 'quizAnswers'
-            ]
+            if type(batch_data) is not list:
+                raise ValueError("Batched response is not a list")
             
-            for i, guide_entry in enumerate(vulnerability_guide):
-                if not isinstance(guide_entry, dict):
-                    raise ValueError(f"Guide entry {i} is not a dictionary")
-                
-                for field in required_guide_fields:
-                    if field not in guide_entry:
-                        raise ValueError(f"Guide entry {i} missing required field: {field}")
+            if len(batch_data) != expected_scans:
+                raise ValueError(f"Batched response has {len(batch_data)} entries, expected {expected_scans}")
             
-            return response_data
+            return [self._validate_response_data(response_data) for response_data in batch_data]
             
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {str(e)}")
-            logger.error(f"Response text (first 500 chars): {response_text[:500]}")
+            logger.error("Failed to parse JSON response: %s", e)
+            logger.error("Response text (first 500 chars): %s", response_text[:500])
             raise Exception(f"Invalid JSON response from Gemini: {str(e)}")
         except Exception as e:
-            logger.error(f"Failed to parse response: {str(e)}")
-            logger.error(f"Response text (first 500 chars): {response_text[:500]}")
+            logger.error("Failed to parse response: %s", e)
+            logger.error("Response text (first 500 chars): %s", response_text[:500])
             raise Exception(f"Failed to parse response: {str(e)}")
     
+    def _validate_response_data(self, response_data: Any, sections: Tuple[str, ...] = RESPONSE_SECTIONS) -> Dict[str, Any]:
+        """Validate the requested sections of a decoded Gemini response, defaulting the others to empty"""
+        # Validate that we got the expected structure (orjson only produces plain dicts and lists)
+        if type(response_data) is not dict:
+            raise ValueError("Response is not a dictionary")
+        
+        missing = [section for section in sections if section not in response_data]
+        if missing:
+            raise ValueError(f"Response missing required field: {', '.join(missing)}")
+        
+        exercises = response_data.get('exercises', [])
+        vulnerability_guide = response_data.get('vulnerability_guide', [])
+        
+        # Validate exercises
+        if type(exercises) is not list:
+            raise ValueError("Exercises is not a list")
+        
+        # Validate each exercise has required fields
+        for i, exercise in enumerate(exercises):
+            if type(exercise) is not dict:
+                raise ValueError(f"Exercise {i} is not a dictionary")
+            
+            missing = self.REQUIRED_EXERCISE_FIELDS.difference(exercise)
+            if missing:
+                raise ValueError(f"Exercise {i} missing required field: {', '.join(sorted(missing))}")
+        
+        # Validate the exercise_type column in one pass
+        exercise_types = [str(exercise['exercise_type']) for exercise in exercises]
+        if not self.VALID_EXERCISE_TYPES.issuperset(exercise_types):
+            i, exercise_type = next(
+                (i, t) for i, t in enumerate(exercise_types) if t not in self.VALID_EXERCISE_TYPES
+            )
+            raise ValueError(f"Exercise {i} has invalid exercise_type: {exercise_type}. Must be one of {sorted(self.VALID_EXERCISE_TYPES)}")
+        
+        # Validate answer_key has only one answer for mcq and fix_config
+        for i, (exercise_type, answer_key) in enumerate(zip(exercise_types, (exercise['answer_key'] for exercise in exercises))):
+            if exercise_type in self.SINGLE_ANSWER_EXERCISE_TYPES:
+                if type(answer_key) is not list or len(answer_key) != 1:
+                    raise ValueError(f"Exercise {i} ({exercise_type}) must have exactly one answer in answer_key array")
+        
+        # Validate vulnerability guide
+        if type(vulnerability_guide) is not list:
+            raise ValueError("Vulnerability guide is not a list")
+        
+        for i, guide_entry in enumerate(vulnerability_guide):
+            if type(guide_entry) is not dict:
+                raise ValueError(f"Guide entry {i} is not a dictionary")
+            
+            missing = self.REQUIRED_GUIDE_FIELDS.difference(guide_entry)
+            if missing:
+                raise ValueError(f"Guide entry {i} missing required field: {', '.join(sorted(missing))}")
+        
+        return {'exercises': exercises, 'vulnerability_guide': vulnerability_guide}
+
 
 # Global instance
 gemini_integration = GeminiIntegration()
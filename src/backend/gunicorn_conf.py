@@ -0,0 +1,33 @@
+"""
+CodeClinic Gunicorn configuration
+Runs the FastAPI app under several Uvicorn workers for production deployments
+
+Usage: gunicorn -c gunicorn_conf.py main:app
+
+Scan task state is mirrored to Redis so any worker can answer status and
+result requests; make sure REDIS_URL points at a shared instance when
+running more than one worker.
+
+Each worker keeps its own Gemini rate limiter, concurrency limit, scanner
+pool and caches, so those limits multiply with WEB_CONCURRENCY.
+"""
+
+import os
+
+# Bind address
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# Uvicorn worker picks up uvloop and httptools from uvicorn[standard]
+worker_class = "uvicorn.workers.UvicornWorker"
+# Work is I/O bound, so a couple of workers is enough and keeps per-worker Gemini limits predictable
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+
+# Long-running Gemini calls and SSE streams need a generous timeout
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+# Logging
+loglevel = os.getenv("LOG_LEVEL", "info")
+accesslog = "-"
+errorlog = "-"
@@ -4,22 +4,27 @@ Main application entry point for the security assessment API
 Simplified parallel scanning with single ZAP instance and thread-based workers
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+import orjson
 import uvicorn
 
 import asyncio
-from typing import List, Optional, Dict, Any
+import hashlib
+import os
+import re
+import sys
+from typing import Iterator, List, Optional, Dict, Any
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-from models import ScanRequest, ScanResponse
-# from zap_integration import ZAPScanner
-# from url_validator import URLValidator
-from gemini_integration import gemini_integration, ZAPDataRequest, GameResponse
-from pydantic import BaseModel
+from anyio import to_thread
+from pydantic import BaseModel, Field
 
-
-from models import ScanRequest, ScanResponse, CrawlRequest, PageSelectionRequest
+from models import ScanRequest, ScanResponse, ScanResultsResponse, CrawlRequest, PageSelectionRequest
+from gemini_integration import gemini_integration, ZAPDataRequest, BatchZAPDataRequest, GameResponse
 from simple_scanner import SimpleParallelScanner
 
 
@@ -27,6 +32,25 @@ from simple_scanner import SimpleParallelScanner
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# URL patterns tried in order when naming a scan from raw ZAP data
+WEBSITE_URL_PATTERNS = [
+    re.compile(r'https?://[^\s]+'),
+    re.compile(r'www\.[^\s]+'),
+    re.compile(r'[a-zA-Z0-9-]+\.[a-zA-Z]{2,}(?:/[^\s]*)?')
+]
+
+# Number of list items encoded per chunk when streaming large JSON responses
+STREAM_CHUNK_SIZE = 200
+
+# Worker threads for blocking calls: sync route code (AnyIO) and Supabase queries (asyncio.to_thread)
+BLOCKING_THREADPOOL_SIZE = int(os.getenv("ANYIO_THREADS", "100"))
+
+# Browser/CDN caching for read-only listings that change slowly
+PUBLIC_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
+# Server-Sent Event routes; gzip would hold events in its buffer instead of sending them immediately
+UNCOMPRESSED_PATH_SUFFIXES = ("/events", "/generate-game/stream")
+
 # Request models
 class CreateQuizAttemptRequest(BaseModel):
     user_id: str
@@ -46,20 +70,43 @@ class SaveQuestionResponseRequest(BaseModel):
     time_taken: int
     user_id: str
 
+class SaveQuestionResponsesRequest(BaseModel):
+    responses: List[SaveQuestionResponseRequest] = Field(..., min_length=1)
+
 try:
     from supabase_client import supabase_client
     logger.info("Supabase client loaded successfully")
 except ImportError as e:
-    logger.warning(f"Supabase client not available: {e}")
+    logger.warning("Supabase client not available: %s", e)
     supabase_client = None
 
+class CompressionMiddleware:
+    """GZip responses over 1 KB, passing Server-Sent Event streams through untouched"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, minimum_size=1024, compresslevel=5)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not scope["path"].endswith(UNCOMPRESSED_PATH_SUFFIXES):
+            await self.gzip_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+async def require_supabase():
+    """Reject database endpoints with a 503 when Supabase is not configured or unreachable"""
+    if not supabase_client or not supabase_client.is_available():
+        raise HTTPException(status_code=503, detail="Database not available")
+    return supabase_client
+
 # Initialize FastAPI app
 app = FastAPI(
     title="CodeClinic API",
     description="Security assessment API for web applications",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend communication
@@ -67,10 +114,16 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # Next.js default
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let Starlette build the preflight headers once instead of reflecting each request
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    # Let browsers reuse a preflight for a day instead of re-sending OPTIONS every 10 minutes
+    max_age=86400,
 )
 
+# Compress JSON responses; scan results and generated questions are highly repetitive text
+app.add_middleware(CompressionMiddleware)
+
 # Initialize simplified parallel scanning system
 scanner = SimpleParallelScanner(max_workers=4)
 
@@ -84,7 +137,7 @@ async def health_check():
     """Detailed health check"""
     return {
         "status": "healthy",
-        "zap_available": await zap_scanner.is_zap_available(),
+        "zap_available": await scanner.is_zap_available(),
         "gemini_available": gemini_integration.is_available(),
         "supabase_available": supabase_client and supabase_client.is_available(),
         "scanner_status": scanner.get_worker_status(),
@@ -105,22 +158,22 @@ async def start_scan(request: ScanRequest):
     """
     try:
         # Convert Pydantic URL to string
-        url_str = str(request.url)
+        url_str = request.url_str
         
-        logger.info(f"Starting scan for URL: {url_str}")
+        logger.info("Starting scan for URL: %s", url_str)
         
         # Start scan using simplified scanner
         task_id = await scanner.start_scan(url_str, request.scan_type)
         message = "Scan initiated successfully"
         
-        return ScanResponse(
+        return ScanResponse.model_construct(
             scan_id=task_id,
             status="started",
             message=message
         )
         
     except Exception as e:
-        logger.error(f"Error starting scan: {str(e)}", exc_info=True)
+        logger.exception("Error starting scan: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to start scan: {str(e)}")
 
 @app.get("/scan/{scan_id}/status")
@@ -128,39 +181,77 @@ async def get_scan_status(scan_id: str):
     """Get the current status of a scan"""
     try:
         # Get status from simplified scanner
-        status = scanner.get_task_status(scan_id)
+        status = await scanner.get_task_status(scan_id)
         if not status:
             raise HTTPException(status_code=404, detail="Scan not found")
-        return status
+        # Polled in a tight loop while scanning; the status dict is already JSON-native
+        return ORJSONResponse(content=status)
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error getting scan status: {str(e)}")
+        logger.error("Error getting scan status: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get scan status")
 
 
-@app.get("/scan/{scan_id}/results")
+@app.get("/scan/{scan_id}/events")
+async def stream_scan_status(scan_id: str):
+    """
+    Stream scan status updates as Server-Sent Events
+    
+    Emits a 'status' event with the same payload as /scan/{scan_id}/status
+    whenever the scan progresses, and closes once it completes or fails.
+    
+    Args:
+        scan_id: ID of the scan or crawl to follow
+        
+    Returns:
+        text/event-stream response
+    """
+    if not await scanner.get_task_status(scan_id):
+        raise HTTPException(status_code=404, detail="Scan not found")
+    
+    async def event_stream():
+        async for status in scanner.watch_task(scan_id):
+            yield f"event: status\ndata: {orjson.dumps(status).decode()}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Streamed without validation; the model only documents the payload
+@app.get("/scan/{scan_id}/results", response_model=None, responses={200: {"model": ScanResultsResponse}})
 async def get_scan_results(scan_id: str):
     """Get the final scan results"""
     try:
         # Get task status from simplified scanner
-        task_status = scanner.get_task_status(scan_id)
+        task_status = await scanner.get_task_status(scan_id)
         if not task_status:
             raise HTTPException(status_code=404, detail="Scan not found")
         
         if task_status["status"] not in ["completed", "failed"]:
             raise HTTPException(status_code=400, detail="Scan not yet completed")
         
-        # Return results
-        return {
-            "id": scan_id,
-            "status": task_status["status"],
-            "progress": task_status["progress"],
-            "vulnerabilities": task_status["results"].get("vulnerabilities", []) if task_status["results"] else [],
-            "total_vulnerabilities": len(task_status["results"].get("vulnerabilities", [])) if task_status["results"] else 0,
-            "scan_duration": task_status["results"].get("scan_duration", 0) if task_status["results"] else 0,
-            "error": task_status.get("error")
-        }
+        # Stream the vulnerability list so large results are never held as a single encoded body
+        results = task_status["results"] or {}
+        vulnerabilities = results.get("vulnerabilities", [])
+        return StreamingResponse(
+            _stream_json_with_list({
+                "id": scan_id,
+                "status": task_status["status"],
+                "progress": task_status["progress"],
+                "total_vulnerabilities": len(vulnerabilities),
+                "scan_duration": results.get("scan_duration", 0),
+                "error": task_status.get("error")
+            }, "vulnerabilities", vulnerabilities),
+            media_type="application/json"
+        )
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error getting scan results: {str(e)}")
+        logger.error("Error getting scan results: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get scan results")
 
 
@@ -199,11 +290,29 @@ async def generate_cybersec_game(
         if not website_url or website_url == "Unknown":
             website_url = _extract_website_from_zap_data(request.zap_data)
         
-        logger.info(f"Generating {request.num_questions} questions from ZAP data for website: {website_url}")
-        result = await gemini_integration.generate_cybersec_questions(
-            zap_data=request.zap_data,
-            num_questions=request.num_questions
-        )
+        # Resolve the user while Gemini generates, so the upsert is off the critical path
+        db_available = supabase_client is not None and supabase_client.is_available()
+        user_task = None
+        if save_to_db and db_available and user_id:
+            logger.info("Creating/getting user: user_id=%s, email=%s, username=%s, full_name=%s, avatar_url=%s", user_id, user_email, user_username, user_full_name, user_avatar_url)
+            user_task = asyncio.create_task(supabase_client.create_or_get_user(
+                clerk_user_id=user_id,
+                email=user_email,
+                username=user_username,
+                full_name=user_full_name,
+                avatar_url=user_avatar_url
+            ))
+        
+        logger.info("Generating %s questions from ZAP data for website: %s", request.num_questions, website_url)
+        try:
+            result = await gemini_integration.generate_cybersec_questions(
+                zap_data=request.zap_data,
+                num_questions=request.num_questions
+            )
+        except Exception:
+            if user_task:
+                user_task.cancel()
+            raise
         
         response_data = {
             "questions": result.exercises,
@@ -211,22 +320,15 @@ async def generate_cybersec_game(
         }
         
         # Save to database if requested and database is available
-        if save_to_db and supabase_client and supabase_client.is_available():
+        if save_to_db and db_available:
             try:
                 logger.info("Saving generated questions and guide to database")
                 
-                # Create or get user if user_id is provided
+                # Collect the user resolved alongside generation
                 db_user_id = None
-                if user_id:
-                    logger.info(f"Creating/getting user: user_id={user_id}, email={user_email}, username={user_username}, full_name={user_full_name}, avatar_url={user_avatar_url}")
-                    db_user_id = await supabase_client.create_or_get_user(
-                        clerk_user_id=user_id,
-                        email=user_email,
-                        username=user_username,
-                        full_name=user_full_name,
-                        avatar_url=user_avatar_url
-                    )
-                    logger.info(f"User created/retrieved with DB ID: {db_user_id}")
+                if user_task:
+                    db_user_id = await user_task
+                    logger.info("User created/retrieved with DB ID: %s", db_user_id)
                 else:
                     logger.warning("No user_id provided - creating anonymous scan")
                 
@@ -252,7 +354,7 @@ async def generate_cybersec_game(
                     if questions_saved and guide_saved:
                         response_data["scan_id"] = scan_id
                         response_data["saved_to_database"] = True
-                        logger.info(f"Successfully saved scan data with ID: {scan_id}")
+                        logger.info("Successfully saved scan data with ID: %s", scan_id)
                     else:
                         logger.warning("Failed to save questions or guide to database")
                         response_data["saved_to_database"] = False
@@ -261,7 +363,7 @@ async def generate_cybersec_game(
                     response_data["saved_to_database"] = False
                     
             except Exception as db_error:
-                logger.error(f"Database save error: {str(db_error)}")
+                logger.error("Database save error: %s", db_error)
                 response_data["saved_to_database"] = False
                 response_data["database_error"] = str(db_error)
         else:
@@ -271,13 +373,91 @@ async def generate_cybersec_game(
                 logger.warning("Database not available - skipping save")
             response_data["saved_to_database"] = False
         
-        return response_data
+        # Generated exercises are already JSON-native, so skip FastAPI's jsonable_encoder pass
+        return ORJSONResponse(content=response_data)
         
     except Exception as e:
-        logger.error(f"Error generating cybersecurity questions: {str(e)}", exc_info=True)
+        logger.exception("Error generating cybersecurity questions: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
 
 
+@app.post("/generate-game/batch")
+async def generate_cybersec_game_batch(request: BatchZAPDataRequest):
+    """
+    Generate cybersecurity training questions for several ZAP scans at once
+    
+    Args:
+        request: BatchZAPDataRequest containing one ZAP data string per scan
+        
+    Returns:
+        JSON payload with questions and vulnerability guide for each scan, in request order
+    """
+    try:
+        if not gemini_integration.is_available():
+            raise HTTPException(
+                status_code=503, 
+                detail="Gemini API is not available. Please check GEMINI_API_KEY environment variable."
+            )
+        
+        logger.info("Generating %s questions each for %s ZAP scans", request.num_questions, len(request.zap_data_list))
+        results = await gemini_integration.generate_cybersec_questions_batch(
+            zap_data_list=request.zap_data_list,
+            num_questions=request.num_questions
+        )
+        
+        return {
+            "results": [
+                {
+                    "questions": result.exercises,
+                    "vulnerability_guide": result.vulnerability_guide
+                }
+                for result in results
+            ]
+        }
+        
+    except Exception as e:
+        logger.exception("Error generating batched cybersecurity questions: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
+
+
+@app.post("/generate-game/stream")
+async def stream_cybersec_game(request: ZAPDataRequest):
+    """
+    Stream cybersecurity training questions as Server-Sent Events
+    
+    Emits a 'questions' event for every batch of questions as soon as Gemini
+    returns it, followed by a 'complete' event (or an 'error' event on failure).
+    Streamed questions are not saved to the database.
+    
+    Args:
+        request: ZAPDataRequest containing ZAP data and number of questions
+        
+    Returns:
+        text/event-stream response
+    """
+    if not gemini_integration.is_available():
+        raise HTTPException(
+            status_code=503, 
+            detail="Gemini API is not available. Please check GEMINI_API_KEY environment variable."
+        )
+    
+    async def event_stream():
+        total_questions = 0
+        try:
+            async for batch in gemini_integration.stream_cybersec_questions(
+                zap_data=request.zap_data,
+                num_questions=request.num_questions
+            ):
+                total_questions += len(batch["exercises"])
+                yield f"event: questions\ndata: {orjson.dumps(batch).decode()}\n\n"
+            yield f"event: complete\ndata: {orjson.dumps({'total_questions': total_questions}).decode()}\n\n"
+        except Exception as e:
+            logger.exception("Error streaming cybersecurity questions: %s", e)
+            yield f"event: error\ndata: {orjson.dumps({'detail': str(e)}).decode()}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.post("/scan/{scan_id}/generate-questions", response_model=GameResponse)
 async def generate_questions_from_scan(scan_id: str, num_questions: int = 25):
     """
@@ -291,11 +471,12 @@ async def generate_questions_from_scan(scan_id: str, num_questions: int = 25):
         GameResponse with generated questions
     """
     try:
-        if scan_id not in scan_results:
+        # Scan state lives in the scanner (backed by Redis), not in a process-local dict
+        task_status = await scanner.get_task_status(scan_id)
+        if not task_status:
             raise HTTPException(status_code=404, detail="Scan not found")
         
-        scan_data = scan_results[scan_id]
-        if scan_data["status"] != "completed":
+        if task_status["status"] != "completed":
             raise HTTPException(status_code=400, detail="Scan not yet completed")
         
         if not gemini_integration.is_available():
@@ -305,62 +486,64 @@ async def generate_questions_from_scan(scan_id: str, num_questions: int = 25):
             )
         
         # Convert vulnerabilities to ZAP data format
-        zap_data = _format_vulnerabilities_for_gemini(scan_data["vulnerabilities"])
+        zap_data = _format_vulnerabilities_for_gemini((task_status["results"] or {}).get("vulnerabilities", []))
         
         result = await gemini_integration.generate_cybersec_questions(
             zap_data=zap_data,
             num_questions=num_questions
         )
         
-        return result
+        # The result was validated when it was built; returning a Response skips response_model re-validation
+        return ORJSONResponse(content=result.model_dump())
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating questions from scan {scan_id}: {str(e)}", exc_info=True)
+        logger.exception("Error generating questions from scan %s: %s", scan_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
 
+def _stream_json_with_list(fields: Dict[str, Any], list_key: str, items: List[Any]) -> Iterator[bytes]:
+    """Encode a JSON object of fields plus one large list, yielding the list in STREAM_CHUNK_SIZE pieces"""
+    yield orjson.dumps(fields)[:-1] + b"," + orjson.dumps(list_key) + b":["
+    for start in range(0, len(items), STREAM_CHUNK_SIZE):
+        chunk = b",".join(orjson.dumps(item) for item in items[start:start + STREAM_CHUNK_SIZE])
+        yield chunk if start == 0 else b"," + chunk
+    yield b"]}"
+
+def _cacheable_json_response(request: Request, payload: Dict[str, Any]) -> Response:
+    """Return payload with an ETag and Cache-Control, or an empty 304 if the client's copy is current"""
+    body = orjson.dumps(payload)
+    headers = {
+        # Weak because the same tag is served for both the gzip and identity encodings
+        "ETag": f'W/"{hashlib.md5(body).hexdigest()}"',
+        "Cache-Control": PUBLIC_CACHE_CONTROL
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
 def _format_vulnerabilities_for_gemini(vulnerabilities) -> str:
     """Format vulnerabilities list into ZAP data format for Gemini"""
     if not vulnerabilities:
         return "No vulnerabilities found in scan."
     
-    formatted_data = []
-    for vuln in vulnerabilities:
-        formatted_data.append(f"{vuln.name} - {vuln.severity} - {vuln.url}")
-    
-    return "\n".join(formatted_data)
+    # Scanner results are plain dicts in the shape built by ZAPScanner._process_alerts
+    return "\n".join(f"{vuln['title']} - {vuln['severity']} - {vuln['url']}" for vuln in vulnerabilities)
 
 def _extract_website_from_zap_data(zap_data: str) -> str:
     """Extract website URL from ZAP data if available"""
-    try:
-        # Look for common URL patterns in the ZAP data
-        import re
-        
-        # Common URL patterns
-        url_patterns = [
-            r'https?://[^\s]+',
-            r'www\.[^\s]+',
-            r'[a-zA-Z0-9-]+\.[a-zA-Z]{2,}(?:/[^\s]*)?'
-        ]
-        
-        for pattern in url_patterns:
-            matches = re.findall(pattern, zap_data)
-            if matches:
-                # Take the first match and clean it up
-                url = matches[0]
-                if not url.startswith(('http://', 'https://')):
-                    url = f"https://{url}"
-                return url
-        
-        # If no URL found, return a generic name
-        return "Security Scan Results"
-        
-    except Exception:
-        return "Security Scan Results"
-
-async def run_scan(scan_id: str, url: str, scan_type: str):
-    """Background task to run the actual scan"""
+    for pattern in WEBSITE_URL_PATTERNS:
+        match = pattern.search(zap_data)
+        if match:
+            # Take the first match and clean it up
+            url = match.group(0)
+            if not url.startswith(('http://', 'https://')):
+                url = f"https://{url}"
+            return url
+    
+    # If no URL found, return a generic name
+    return "Security Scan Results"
 
 @app.post("/crawl/start", response_model=ScanResponse)
 async def start_crawl(request: CrawlRequest):
@@ -370,22 +553,22 @@ async def start_crawl(request: CrawlRequest):
     """
     try:
         # Convert Pydantic URL to string
-        url_str = str(request.url)
+        url_str = request.url_str
         
-        logger.info(f"Starting crawl for URL: {url_str}")
+        logger.info("Starting crawl for URL: %s", url_str)
         
         # Start crawl using simplified scanner
         task_id = await scanner.start_crawl(url_str)
         message = "Crawl initiated successfully"
         
-        return ScanResponse(
+        return ScanResponse.model_construct(
             scan_id=task_id,
             status="started",
             message=message
         )
         
     except Exception as e:
-        logger.error(f"Error starting crawl: {str(e)}", exc_info=True)
+        logger.exception("Error starting crawl: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to start crawl: {str(e)}")
 
 
@@ -394,21 +577,26 @@ async def get_discovered_pages(scan_id: str):
     """Get the pages discovered during crawling"""
     try:
         # Get task status from simplified scanner
-        task_status = scanner.get_task_status(scan_id)
+        task_status = await scanner.get_task_status(scan_id)
         if not task_status:
             raise HTTPException(status_code=404, detail="Crawl not found")
         
         if task_status["status"] not in ["completed"]:
             raise HTTPException(status_code=400, detail="Crawl not yet completed")
         
-        # Return discovered pages
-        return {
-            "scan_id": scan_id,
-            "pages": task_status["results"].get("discovered_pages", []) if task_status["results"] else [],
-            "total_pages": len(task_status["results"].get("discovered_pages", [])) if task_status["results"] else 0
-        }
+        # Stream discovered pages; large crawls can return thousands of URLs
+        pages = (task_status["results"] or {}).get("discovered_pages", [])
+        return StreamingResponse(
+            _stream_json_with_list({
+                "scan_id": scan_id,
+                "total_pages": len(pages)
+            }, "pages", pages),
+            media_type="application/json"
+        )
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error getting discovered pages: {str(e)}")
+        logger.error("Error getting discovered pages: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get discovered pages")
 
 
@@ -423,14 +611,14 @@ async def start_selected_scan(request: PageSelectionRequest):
         task_id = await scanner.start_scan_selected(request.scan_id, request.selected_pages)
         message = "Selected page scan initiated successfully"
         
-        return ScanResponse(
+        return ScanResponse.model_construct(
             scan_id=task_id,
             status="started",
             message=message
         )
         
     except Exception as e:
-        logger.error(f"Error starting selected scan: {str(e)}", exc_info=True)
+        logger.exception("Error starting selected scan: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to start selected scan: {str(e)}")
 
 
@@ -438,29 +626,47 @@ async def start_selected_scan(request: PageSelectionRequest):
 async def get_system_status():
     """Get system-wide status and performance metrics"""
     try:
+        threadpool = to_thread.current_default_thread_limiter().statistics()
         return {
             "scanner_status": scanner.get_worker_status(),
+            "threadpool": {
+                "total": BLOCKING_THREADPOOL_SIZE,
+                "in_use": threadpool.borrowed_tokens,
+                "waiting": threadpool.tasks_waiting
+            },
             "version": "1.0.0"
         }
     except Exception as e:
-        logger.error(f"Error getting system status: {str(e)}")
+        logger.error("Error getting system status: %s", e)
         return {"error": "Failed to get system status"}
 
+async def _warm_up_services():
+    """Check ZAP connectivity and open Gemini connections concurrently"""
+    zap_ready, _ = await asyncio.gather(scanner.initialize(), gemini_integration.warm_up())
+    if zap_ready:
+        logger.info("✅ Simplified parallel scanning system initialized successfully")
+        logger.info("🚀 Performance boost: %s worker threads ready", scanner.max_workers)
+    else:
+        logger.warning("⚠️  Scanner initialization failed - using sequential mode")
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize simplified parallel scanning system on startup"""
     try:
         logger.info("Starting CodeClinic with simplified parallel scanning...")
         
-        # Initialize simplified scanner
-        if await scanner.initialize():
-            logger.info("✅ Simplified parallel scanning system initialized successfully")
-            logger.info(f"🚀 Performance boost: {scanner.max_workers} worker threads ready")
-        else:
-            logger.warning("⚠️  Scanner initialization failed - using sequential mode")
+        # Size both thread pools used for blocking work to the same budget
+        to_thread.current_default_thread_limiter().total_tokens = BLOCKING_THREADPOOL_SIZE
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=BLOCKING_THREADPOOL_SIZE, thread_name_prefix="blocking")
+        )
+        
+        # Probe ZAP and warm Gemini in the background so the API accepts requests immediately;
+        # neither is required to serve a request, each scan connects to ZAP on its own
+        app.state.warm_up_task = asyncio.create_task(_warm_up_services())
             
     except Exception as e:
-        logger.error(f"❌ Failed to initialize scanner: {str(e)}")
+        logger.error("❌ Failed to initialize scanner: %s", e)
         logger.info("🔄 Falling back to sequential scanning mode")
 
 @app.on_event("shutdown")
@@ -471,18 +677,15 @@ async def shutdown_event():
         scanner.shutdown()
         logger.info("CodeClinic shutdown complete")
     except Exception as e:
-        logger.error(f"Error during shutdown: {str(e)}")
+        logger.error("Error during shutdown: %s", e)
 
 # Database endpoints
-@app.post("/save-scan-results")
+@app.post("/save-scan-results", dependencies=[Depends(require_supabase)])
 async def save_scan_results(request: ZAPDataRequest, website_url: str, user_id: str = None):
     """
     Save scan results to database with questions and vulnerability guide
     """
     try:
-        if not supabase_client or not supabase_client.is_available():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
         # Generate questions and guide
         result = await gemini_integration.generate_cybersec_questions(
             zap_data=request.zap_data,
@@ -515,11 +718,12 @@ async def save_scan_results(request: ZAPDataRequest, website_url: str, user_id:
         }
         
     except Exception as e:
-        logger.error(f"Error saving scan results: {str(e)}", exc_info=True)
+        logger.exception("Error saving scan results: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to save scan results: {str(e)}")
 
-@app.get("/public-scans")
+@app.get("/public-scans", dependencies=[Depends(require_supabase)])
 async def get_public_scans(
+    request: Request,
     difficulty: Optional[str] = None,
     exercise_type: Optional[str] = None,
     limit: int = 20,
@@ -529,41 +733,32 @@ async def get_public_scans(
     Get public scans with optional filters
     """
     try:
-        if not supabase_client or not supabase_client.is_available():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
         scans = await supabase_client.get_public_scans(difficulty, exercise_type, limit, offset)
-        return {"scans": scans}
+        return _cacheable_json_response(request, {"scans": scans})
         
     except Exception as e:
-        logger.error(f"Error getting public scans: {str(e)}", exc_info=True)
+        logger.exception("Error getting public scans: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get public scans: {str(e)}")
 
-@app.get("/leaderboard")
-async def get_leaderboard(limit: int = 10):
+@app.get("/leaderboard", dependencies=[Depends(require_supabase)])
+async def get_leaderboard(request: Request, limit: int = 10):
     """
     Get leaderboard data
     """
     try:
-        if not supabase_client or not supabase_client.is_available():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
         leaderboard = await supabase_client.get_leaderboard(limit)
-        return {"leaderboard": leaderboard}
+        return _cacheable_json_response(request, {"leaderboard": leaderboard})
         
     except Exception as e:
-        logger.error(f"Error getting leaderboard: {str(e)}", exc_info=True)
+        logger.exception("Error getting leaderboard: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get leaderboard: {str(e)}")
 
-@app.post("/update-user-stats/{user_id}")
+@app.post("/update-user-stats/{user_id}", dependencies=[Depends(require_supabase)])
 async def update_user_stats(user_id: str):
     """
     Manually update user stats for a specific user
     """
     try:
-        if not supabase_client or not supabase_client.is_available():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
         success = await supabase_client.update_user_stats(user_id)
         
         if success:
@@ -572,18 +767,15 @@ async def update_user_stats(user_id: str):
             raise HTTPException(status_code=500, detail="Failed to update user stats")
         
     except Exception as e:
-        logger.error(f"Error updating user stats: {str(e)}", exc_info=True)
+        logger.exception("Error updating user stats: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to update user stats: {str(e)}")
 
-@app.post("/update-user-info")
+@app.post("/update-user-info", dependencies=[Depends(require_supabase)])
 async def update_user_info(request: dict):
     """
     Update user information (email, username, full_name, avatar_url)
     """
     try:
-        if not supabase_client or not supabase_client.is_available():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
         user_id = request.get('user_id')
         if not user_id:
             raise HTTPException(status_code=400, detail="user_id is required")
@@ -598,55 +790,48 @@ async def update_user_info(request: dict):
         if not update_data:
             raise HTTPException(status_code=400, detail="No update data provided")
         
-        result = supabase_client.client.table('users').update(update_data).eq('id', user_id).execute()
-        
-        if result.data:
+        if await supabase_client.update_user(user_id, update_data):
             return {"success": True, "message": f"User information updated for user {user_id}"}
         else:
             raise HTTPException(status_code=500, detail="Failed to update user information")
         
     except Exception as e:
-        logger.error(f"Error updating user info: {str(e)}", exc_info=True)
+        logger.exception("Error updating user info: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to update user info: {str(e)}")
 
-@app.get("/scan/{scan_id}/questions")
+@app.get("/scan/{scan_id}/questions", dependencies=[Depends(require_supabase)])
 async def get_scan_questions(scan_id: str):
     """
     Get questions for a specific scan
     """
     try:
-        if not supabase_client or not supabase_client.is_available():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
         questions = await supabase_client.get_scan_questions(scan_id)
         guide = await supabase_client.get_scan_guide(scan_id)
         
         # Get scan information
         scan_info = await supabase_client.get_scan_info(scan_id)
         
-        return {
+        # Rows from Supabase are already JSON-native, so skip FastAPI's jsonable_encoder pass
+        return ORJSONResponse(content={
             "questions": questions,
             "vulnerability_guide": guide,
             "website_title": scan_info.get('website_title', 'Unknown Website'),
             "website_url": scan_info.get('website_url', 'Unknown'),
             "created_by": scan_info.get('created_by_username', 'Anonymous')
-        }
+        })
         
     except Exception as e:
-        logger.error(f"Error getting scan questions: {str(e)}", exc_info=True)
+        logger.exception("Error getting scan questions: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get scan questions: {str(e)}")
 
-@app.post("/create-quiz-attempt")
+@app.post("/create-quiz-attempt", dependencies=[Depends(require_supabase)])
 async def create_quiz_attempt(request: CreateQuizAttemptRequest):
     """
     Create a new quiz attempt
     """
     try:
-        if not supabase_client or not supabase_client.is_available():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
         # Log the user data being received
-        logger.info(f"Received user data: user_id={request.user_id}, email={request.user_email}, username={request.user_username}, full_name={request.user_full_name}, avatar_url={request.user_avatar_url}")
+        logger.info("Received user data: user_id=%s, email=%s, username=%s, full_name=%s, avatar_url=%s", request.user_id, request.user_email, request.user_username, request.user_full_name, request.user_avatar_url)
         
         # Get or create user
         db_user_id = await supabase_client.create_or_get_user(
@@ -678,18 +863,15 @@ async def create_quiz_attempt(request: CreateQuizAttemptRequest):
             raise HTTPException(status_code=500, detail="Failed to create quiz attempt")
             
     except Exception as e:
-        logger.error(f"Error creating quiz attempt: {str(e)}", exc_info=True)
+        logger.exception("Error creating quiz attempt: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to create quiz attempt: {str(e)}")
 
-@app.post("/save-question-response")
+@app.post("/save-question-response", dependencies=[Depends(require_supabase)])
 async def save_question_response(request: SaveQuestionResponseRequest):
     """
     Save individual question response
     """
     try:
-        if not supabase_client or not supabase_client.is_available():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
         response_data = {
             "quiz_attempt_id": request.quiz_attempt_id,
             "question_id": request.question_id,
@@ -708,10 +890,31 @@ async def save_question_response(request: SaveQuestionResponseRequest):
             raise HTTPException(status_code=500, detail="Failed to save question response")
             
     except Exception as e:
-        logger.error(f"Error saving question response: {str(e)}", exc_info=True)
+        logger.exception("Error saving question response: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to save question response: {str(e)}")
 
-@app.post("/save-quiz-attempt")
+@app.post("/save-question-responses", dependencies=[Depends(require_supabase)])
+async def save_question_responses(request: SaveQuestionResponsesRequest):
+    """
+    Save a batch of question responses with one database insert
+    """
+    try:
+        response_ids = await supabase_client.save_question_response_batch(
+            [response.model_dump() for response in request.responses]
+        )
+        
+        if not response_ids:
+            raise HTTPException(status_code=500, detail="Failed to save question responses")
+        
+        return {"response_ids": response_ids, "success": True}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error saving question responses: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to save question responses: {str(e)}")
+
+@app.post("/save-quiz-attempt", dependencies=[Depends(require_supabase)])
 async def save_quiz_attempt(
     user_id: str,
     scan_id: str,
@@ -726,9 +929,6 @@ async def save_quiz_attempt(
     Save quiz attempt and responses
     """
     try:
-        if not supabase_client or not supabase_client.is_available():
-            raise HTTPException(status_code=503, detail="Database not available")
-        
         # Save quiz attempt
         attempt_data = {
             "user_id": user_id,
@@ -753,7 +953,7 @@ async def save_quiz_attempt(
         return {"attempt_id": attempt_id, "success": True}
         
     except Exception as e:
-        logger.error(f"Error saving quiz attempt: {str(e)}", exc_info=True)
+        logger.exception("Error saving quiz attempt: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to save quiz attempt: {str(e)}")
 
 if __name__ == "__main__":
@@ -761,6 +961,10 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        reload=os.getenv("UVICORN_RELOAD", "true").lower() == "true",
+        # Worker processes when not reloading; scan state is shared between them through Redis
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
         log_level="info"
     )
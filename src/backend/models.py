@@ -4,52 +4,65 @@ Data validation and serialization models
 """
 
 from pydantic import BaseModel, HttpUrl, Field
-from enum import Enum
-from typing import List
+from functools import cached_property
+from typing import Any, Dict, List, Literal, Optional
 
-class ScanType(str, Enum):
-    """Types of scans available"""
-    FULL_SITE = "full_site"
-    SELECTIVE_PAGES = "selective_pages"
+# Types of scans available; a Literal keeps scan_type a plain str, matching what the scanner stores and returns
+ScanType = Literal["full_site", "selective_pages"]
 
 
 class ScanRequest(BaseModel):
     """Request model for starting a scan"""
     url: HttpUrl = Field(..., description="URL to scan")
     scan_type: ScanType = Field(..., description="Type of scan to perform")
+    
+    class Config:
+        frozen = True
+        extra = "forbid"
+    
+    @cached_property
+    def url_str(self) -> str:
+        """URL as a plain string, rendered once per request"""
+        return str(self.url)
 
 
 class CrawlRequest(BaseModel):
     """Request model for starting a crawl"""
     url: HttpUrl = Field(..., description="URL to crawl")
+    
+    class Config:
+        frozen = True
+        extra = "forbid"
+    
+    @cached_property
+    def url_str(self) -> str:
+        """URL as a plain string, rendered once per request"""
+        return str(self.url)
 
 
 class PageSelectionRequest(BaseModel):
     """Request model for selecting pages to scan"""
-    scan_id: str = Field(..., description="Scan ID from crawl")
-    selected_pages: List[str] = Field(..., description="List of page URLs to scan")
+    scan_id: str = Field(..., description="Scan ID from crawl", examples=["crawl_1700000000000_1a2b3c4d"])
+    selected_pages: List[str] = Field(..., description="List of page URLs to scan", examples=[["https://example.com/login"]])
     
     class Config:
-        json_schema_extra = {
-            "example": {
-                "url": "https://example.com",
-                "scan_type": "full_site"
-            }
-        }
+        frozen = True
+        extra = "forbid"
 
 
 class ScanResponse(BaseModel):
     """Response model for scan initiation"""
-    scan_id: str = Field(..., description="Unique scan identifier")
-    status: str = Field(..., description="Current scan status")
-    message: str = Field(..., description="Status message")
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "scan_id": "scan_123_1234567890",
-                "status": "started",
-                "message": "Scan initiated successfully"
-            }
-        }
+    scan_id: str = Field(..., description="Unique scan identifier", examples=["scan_1700000000000_1a2b3c4d"])
+    status: str = Field(..., description="Current scan status", examples=["started"])
+    message: str = Field(..., description="Status message", examples=["Scan initiated successfully"])
+
 
+class ScanResultsResponse(BaseModel):
+    """Response model for completed scan results"""
+    id: str = Field(..., description="Unique scan identifier")
+    status: str = Field(..., description="Final scan status")
+    progress: int = Field(..., description="Scan progress percentage")
+    total_vulnerabilities: int = Field(..., description="Number of vulnerabilities found")
+    scan_duration: float = Field(..., description="Scan duration in seconds")
+    error: Optional[str] = Field(None, description="Error message if the scan failed")
+    vulnerabilities: List[Dict[str, Any]] = Field(..., description="Vulnerabilities reported by ZAP")
@@ -0,0 +1,97 @@
+"""
+Response cache backends for CodeClinic
+Stores generated Gemini payloads so identical requests skip the API call
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Default cache settings
+RESPONSE_CACHE_SIZE = 128
+RESPONSE_CACHE_TTL = int(os.getenv("GEMINI_CACHE_TTL", "600"))  # seconds
+
+
+class ResponseCache(Protocol):
+    """Interface shared by all response cache backends"""
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        ...
+
+
+class MemoryResponseCache:
+    """Bounded in-process LRU cache with a per-entry TTL"""
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached payload if present and not expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a payload, evicting the least recently used entries over capacity"""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+class RedisResponseCache:
+    """Redis-backed cache shared between processes, serialized with orjson"""
+
+    def __init__(self, redis_url: str, ttl: float = RESPONSE_CACHE_TTL, prefix: str = "gemini_cache:"):
+        import redis.asyncio as redis_asyncio
+
+        self.ttl = int(ttl)
+        self.prefix = prefix
+        self.redis_client = redis_asyncio.from_url(redis_url)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached payload, treating Redis errors as a cache miss"""
+        try:
+            raw = await self.redis_client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("Redis cache lookup failed: %s", e)
+            return None
+
+        return orjson.loads(raw) if raw else None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a payload with the configured TTL"""
+        try:
+            await self.redis_client.set(self.prefix + key, orjson.dumps(value), ex=self.ttl)
+        except Exception as e:
+            logger.warning("Redis cache store failed: %s", e)
+
+
+def create_response_cache() -> ResponseCache:
+    """Build the cache backend selected by GEMINI_CACHE_BACKEND ("memory" or "redis")"""
+    backend = os.getenv("GEMINI_CACHE_BACKEND", "memory").lower()
+    if backend == "redis":
+        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+        logger.info("Using Redis response cache at %s", redis_url)
+        return RedisResponseCache(redis_url)
+
+    return MemoryResponseCache()
@@ -22,6 +22,12 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        # uvloop and httptools ship with uvicorn[standard]; uvloop is unavailable on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        # Auto-reload is for local development; set UVICORN_RELOAD=false in production
+        reload=os.getenv("UVICORN_RELOAD", "true").lower() == "true",
+        # Worker processes when not reloading; scan state is shared between them through Redis
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
         log_level="info"
     )
@@ -6,9 +6,13 @@ This replaces the complex Docker-based approach with a simple thread-based syste
 import asyncio
 import logging
 import time
+import uuid
+from collections import Counter, OrderedDict
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
+import orjson
 import redis
+import redis.asyncio as redis_asyncio
 import httpx
 from dataclasses import dataclass
 from enum import Enum
@@ -16,6 +20,18 @@ from zap_scanner import ZAPScanner
 
 logger = logging.getLogger(__name__)
 
+# How long a ZAP availability check is reused before probing ZAP again
+ZAP_AVAILABILITY_TTL = 5.0  # seconds
+
+# How often a status stream re-reads a task if no update event arrives
+STATUS_STREAM_POLL_INTERVAL = 2.0  # seconds
+
+# Redis pub/sub channel prefix used to announce task updates to every worker process
+TASK_EVENTS_CHANNEL = "task_events:"
+
+# Finished tasks loaded from Redis that are kept in memory; their state no longer changes
+FINISHED_TASK_CACHE_SIZE = 256
+
 class ScanStatus(Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -52,6 +68,7 @@ class SimpleParallelScanner:
         # Redis for task coordination
         redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
         self.redis_client = redis.from_url(redis_url, decode_responses=True)
+        self.async_redis_client = redis_asyncio.from_url(redis_url, decode_responses=True)
         
         # Thread pool for parallel processing
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
@@ -59,9 +76,19 @@ class SimpleParallelScanner:
         # Task storage
         self.tasks: Dict[str, ScanTask] = {}
         
+        # Finished tasks owned by other worker processes, so repeated lookups skip Redis
+        self._finished_remote_tasks: "OrderedDict[str, ScanTask]" = OrderedDict()
+        
         # Worker status
         self.workers = {}
         
+        # Last ZAP availability probe as (monotonic timestamp, result)
+        self._zap_availability = (float("-inf"), False)
+        
+        # Status stream subscribers per task, woken from worker threads on the event loop
+        self._watchers: Dict[str, List[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
         logger.info(f"Initialized SimpleParallelScanner with {max_workers} workers")
     
     async def initialize(self) -> bool:
@@ -81,6 +108,23 @@ class SimpleParallelScanner:
             logger.error(f"Failed to connect to ZAP: {e}")
             return False
     
+    async def is_zap_available(self) -> bool:
+        """Check ZAP connectivity, reusing the last result for ZAP_AVAILABILITY_TTL seconds"""
+        checked_at, available = self._zap_availability
+        if time.monotonic() - checked_at < ZAP_AVAILABILITY_TTL:
+            return available
+        
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(f"{self.zap_base_url}/JSON/core/view/version/", timeout=5)
+                available = response.status_code == 200
+        except Exception as e:
+            logger.warning(f"ZAP availability check failed: {e}")
+            available = False
+        
+        self._zap_availability = (time.monotonic(), available)
+        return available
+    
     def _is_zap_accessible(self) -> bool:
         """Check if ZAP is accessible (synchronous version)"""
         try:
@@ -98,9 +142,13 @@ class SimpleParallelScanner:
             logger.error(f"Failed to connect to ZAP: {e}")
             return False
     
+    def _new_task_id(self, prefix: str) -> str:
+        """Build a unique task ID; the random suffix keeps IDs distinct for tasks started in the same millisecond"""
+        return f"{prefix}_{int(time.time() * 1000)}_{uuid.uuid4().hex[:8]}"
+    
     async def start_scan(self, url: str, scan_type: str = "full_site") -> str:
         """Start a new scan task"""
-        task_id = f"scan_{int(time.time() * 1000)}"
+        task_id = self._new_task_id("scan")
         
         task = ScanTask(
             task_id=task_id,
@@ -112,8 +160,8 @@ class SimpleParallelScanner:
         
         self.tasks[task_id] = task
         
-        # Store in Redis for persistence
-        self.redis_client.hset(f"task:{task_id}", mapping={
+        # Store in Redis for persistence without blocking the event loop
+        await asyncio.to_thread(self.redis_client.hset, f"task:{task_id}", mapping={
             "url": url,
             "scan_type": scan_type,
             "status": ScanStatus.PENDING.value,
@@ -128,7 +176,7 @@ class SimpleParallelScanner:
     
     async def start_crawl(self, url: str) -> str:
         """Start a new crawl task to discover pages"""
-        task_id = f"crawl_{int(time.time() * 1000)}"
+        task_id = self._new_task_id("crawl")
         
         task = ScanTask(
             task_id=task_id,
@@ -140,8 +188,8 @@ class SimpleParallelScanner:
         
         self.tasks[task_id] = task
         
-        # Store in Redis for persistence
-        self.redis_client.hset(f"task:{task_id}", mapping={
+        # Store in Redis for persistence without blocking the event loop
+        await asyncio.to_thread(self.redis_client.hset, f"task:{task_id}", mapping={
             "url": url,
             "scan_type": "crawl",
             "status": ScanStatus.PENDING.value,
@@ -156,10 +204,10 @@ class SimpleParallelScanner:
     
     async def start_scan_selected(self, crawl_task_id: str, selected_pages: List[str]) -> str:
         """Start scanning selected pages from a previous crawl"""
-        task_id = f"scan_{int(time.time() * 1000)}"
+        task_id = self._new_task_id("scan")
         
         # Get the original URL from the crawl task
-        crawl_task = self.tasks.get(crawl_task_id)
+        crawl_task = await self._get_task(crawl_task_id)
         if not crawl_task:
             raise Exception(f"Crawl task {crawl_task_id} not found")
         
@@ -176,8 +224,8 @@ class SimpleParallelScanner:
         
         self.tasks[task_id] = task
         
-        # Store in Redis for persistence
-        self.redis_client.hset(f"task:{task_id}", mapping={
+        # Store in Redis for persistence without blocking the event loop
+        await asyncio.to_thread(self.redis_client.hset, f"task:{task_id}", mapping={
             "url": crawl_task.url,
             "scan_type": "selective_pages",
             "status": ScanStatus.PENDING.value,
@@ -207,6 +255,7 @@ class SimpleParallelScanner:
             self.redis_client.hset(f"task:{task_id}", "status", ScanStatus.RUNNING.value)
             self.redis_client.hset(f"task:{task_id}", "worker_id", task.worker_id)
             self.redis_client.hset(f"task:{task_id}", "started_at", str(task.started_at))
+            self._notify_watchers(task_id)
             
             logger.info(f"Worker {task.worker_id} starting scan for {task.url}")
             
@@ -219,9 +268,14 @@ class SimpleParallelScanner:
             task.results = results
             task.progress = 100
             
-            self.redis_client.hset(f"task:{task_id}", "status", ScanStatus.COMPLETED.value)
-            self.redis_client.hset(f"task:{task_id}", "completed_at", str(task.completed_at))
-            self.redis_client.hset(f"task:{task_id}", "progress", "100")
+            # One HSET so other workers never see a completed task without its results
+            self.redis_client.hset(f"task:{task_id}", mapping={
+                "status": ScanStatus.COMPLETED.value,
+                "completed_at": str(task.completed_at),
+                "progress": "100",
+                "results": orjson.dumps(results).decode()
+            })
+            self._notify_watchers(task_id)
             
             logger.info(f"Worker {task.worker_id} completed scan for {task.url}")
             
@@ -232,9 +286,12 @@ class SimpleParallelScanner:
                 self.tasks[task_id].error = str(e)
                 self.tasks[task_id].completed_at = time.time()
                 
-                self.redis_client.hset(f"task:{task_id}", "status", ScanStatus.FAILED.value)
-                self.redis_client.hset(f"task:{task_id}", "error", str(e))
-                self.redis_client.hset(f"task:{task_id}", "completed_at", str(time.time()))
+                self.redis_client.hset(f"task:{task_id}", mapping={
+                    "status": ScanStatus.FAILED.value,
+                    "error": str(e),
+                    "completed_at": str(self.tasks[task_id].completed_at)
+                })
+                self._notify_watchers(task_id)
     
     def _run_crawl_task(self, task_id: str) -> None:
         """Run a crawl task in a worker thread"""
@@ -252,6 +309,7 @@ class SimpleParallelScanner:
             self.redis_client.hset(f"task:{task_id}", "status", ScanStatus.RUNNING.value)
             self.redis_client.hset(f"task:{task_id}", "worker_id", task.worker_id)
             self.redis_client.hset(f"task:{task_id}", "started_at", str(task.started_at))
+            self._notify_watchers(task_id)
             
             logger.info(f"Worker {task.worker_id} starting crawl for {task.url}")
             
@@ -264,9 +322,14 @@ class SimpleParallelScanner:
             task.results = results
             task.progress = 100
             
-            self.redis_client.hset(f"task:{task_id}", "status", ScanStatus.COMPLETED.value)
-            self.redis_client.hset(f"task:{task_id}", "completed_at", str(task.completed_at))
-            self.redis_client.hset(f"task:{task_id}", "progress", "100")
+            # One HSET so other workers never see a completed task without its results
+            self.redis_client.hset(f"task:{task_id}", mapping={
+                "status": ScanStatus.COMPLETED.value,
+                "completed_at": str(task.completed_at),
+                "progress": "100",
+                "results": orjson.dumps(results).decode()
+            })
+            self._notify_watchers(task_id)
             
             logger.info(f"Worker {task.worker_id} completed crawl for {task.url}")
             
@@ -277,9 +340,12 @@ class SimpleParallelScanner:
                 self.tasks[task_id].error = str(e)
                 self.tasks[task_id].completed_at = time.time()
                 
-                self.redis_client.hset(f"task:{task_id}", "status", ScanStatus.FAILED.value)
-                self.redis_client.hset(f"task:{task_id}", "error", str(e))
-                self.redis_client.hset(f"task:{task_id}", "completed_at", str(time.time()))
+                self.redis_client.hset(f"task:{task_id}", mapping={
+                    "status": ScanStatus.FAILED.value,
+                    "error": str(e),
+                    "completed_at": str(self.tasks[task_id].completed_at)
+                })
+                self._notify_watchers(task_id)
     
     def _run_scan_selected_task(self, task_id: str) -> None:
         """Run a scan task for selected pages in a worker thread"""
@@ -297,6 +363,7 @@ class SimpleParallelScanner:
             self.redis_client.hset(f"task:{task_id}", "status", ScanStatus.RUNNING.value)
             self.redis_client.hset(f"task:{task_id}", "worker_id", task.worker_id)
             self.redis_client.hset(f"task:{task_id}", "started_at", str(task.started_at))
+            self._notify_watchers(task_id)
             
             logger.info(f"Worker {task.worker_id} starting selected scan for {task.url}")
             
@@ -310,9 +377,14 @@ class SimpleParallelScanner:
             task.results = results
             task.progress = 100
             
-            self.redis_client.hset(f"task:{task_id}", "status", ScanStatus.COMPLETED.value)
-            self.redis_client.hset(f"task:{task_id}", "completed_at", str(task.completed_at))
-            self.redis_client.hset(f"task:{task_id}", "progress", "100")
+            # One HSET so other workers never see a completed task without its results
+            self.redis_client.hset(f"task:{task_id}", mapping={
+                "status": ScanStatus.COMPLETED.value,
+                "completed_at": str(task.completed_at),
+                "progress": "100",
+                "results": orjson.dumps(results).decode()
+            })
+            self._notify_watchers(task_id)
             
             logger.info(f"Worker {task.worker_id} completed selected scan for {task.url}")
             
@@ -323,9 +395,12 @@ class SimpleParallelScanner:
                 self.tasks[task_id].error = str(e)
                 self.tasks[task_id].completed_at = time.time()
                 
-                self.redis_client.hset(f"task:{task_id}", "status", ScanStatus.FAILED.value)
-                self.redis_client.hset(f"task:{task_id}", "error", str(e))
-                self.redis_client.hset(f"task:{task_id}", "completed_at", str(time.time()))
+                self.redis_client.hset(f"task:{task_id}", mapping={
+                    "status": ScanStatus.FAILED.value,
+                    "error": str(e),
+                    "completed_at": str(self.tasks[task_id].completed_at)
+                })
+                self._notify_watchers(task_id)
     
     def _perform_zap_scan(self, url: str, scan_type: str, task_id: str) -> Dict:
         """Perform the actual ZAP scan using Python API"""
@@ -344,6 +419,7 @@ class SimpleParallelScanner:
                 # Also update the task in memory
                 if task_id in self.tasks:
                     self.tasks[task_id].progress = progress
+                self._notify_watchers(task_id)
             
             # Perform the scan
             results = zap_scanner.scan_url(url, progress_callback=progress_callback)
@@ -403,6 +479,7 @@ class SimpleParallelScanner:
                 # Also update the task in memory
                 if task_id in self.tasks:
                     self.tasks[task_id].progress = progress
+                self._notify_watchers(task_id)
             
             # Perform the crawl
             results = zap_scanner.crawl_url(url, progress_callback=progress_callback)
@@ -442,6 +519,7 @@ class SimpleParallelScanner:
                 # Also update the task in memory
                 if task_id in self.tasks:
                     self.tasks[task_id].progress = progress
+                self._notify_watchers(task_id)
             
             # Perform the scan for selected pages
             results = zap_scanner.scan_selected_pages(url, selected_pages, progress_callback=progress_callback)
@@ -485,12 +563,51 @@ class SimpleParallelScanner:
             return fallback_results
     
     
-    def get_task_status(self, task_id: str) -> Optional[Dict]:
+    async def _get_task(self, task_id: str) -> Optional[ScanTask]:
+        """Look up a task locally, falling back to Redis for tasks started by another worker process"""
+        task = self.tasks.get(task_id) or self._finished_remote_tasks.get(task_id)
+        if task:
+            return task
+        
+        try:
+            data = await self.async_redis_client.hgetall(f"task:{task_id}")
+        except redis.RedisError as e:
+            logger.warning(f"Redis task lookup failed for {task_id}: {e}")
+            return None
+        if not data:
+            return None
+        
+        task = ScanTask(
+            task_id=task_id,
+            url=data["url"],
+            scan_type=data["scan_type"],
+            status=ScanStatus(data["status"]),
+            worker_id=data.get("worker_id"),
+            progress=int(data.get("progress", 0)),
+            results=orjson.loads(data["results"]) if "results" in data else None,
+            error=data.get("error"),
+            created_at=float(data["created_at"]),
+            started_at=float(data["started_at"]) if "started_at" in data else None,
+            completed_at=float(data["completed_at"]) if "completed_at" in data else None
+        )
+        
+        if task.status in (ScanStatus.COMPLETED, ScanStatus.FAILED):
+            self._finished_remote_tasks[task_id] = task
+            while len(self._finished_remote_tasks) > FINISHED_TASK_CACHE_SIZE:
+                self._finished_remote_tasks.popitem(last=False)
+        
+        return task
+    
+    async def get_task_status(self, task_id: str) -> Optional[Dict]:
         """Get the status of a scan task"""
-        task = self.tasks.get(task_id)
+        task = await self._get_task(task_id)
         if not task:
             return None
         
+        return self._task_status(task)
+    
+    def _task_status(self, task: ScanTask) -> Dict:
+        """Build the public status payload for a task"""
         return {
             "task_id": task.task_id,
             "url": task.url,
@@ -506,6 +623,79 @@ class SimpleParallelScanner:
             "results": task.results
         }
     
+    async def watch_task(self, task_id: str) -> AsyncIterator[Dict]:
+        """Yield the task status whenever it changes, ending once the task completes or fails"""
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._watchers.setdefault(task_id, []).append(queue)
+        
+        # Tasks owned by another worker process announce their updates over Redis pub/sub
+        forwarder = None
+        if task_id not in self.tasks:
+            forwarder = asyncio.create_task(self._forward_task_events(task_id, queue))
+        
+        last_status = None
+        try:
+            while True:
+                status = await self.get_task_status(task_id)
+                if not status:
+                    return
+                
+                if status != last_status:
+                    yield status
+                    last_status = status
+                
+                if status["status"] in (ScanStatus.COMPLETED.value, ScanStatus.FAILED.value):
+                    return
+                
+                # Wake on the next update, or re-read periodically in case an event was missed
+                try:
+                    await asyncio.wait_for(queue.get(), timeout=STATUS_STREAM_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                
+                # Coalesce bursts of progress updates into a single re-read
+                while not queue.empty():
+                    queue.get_nowait()
+        finally:
+            if forwarder:
+                forwarder.cancel()
+            watchers = self._watchers.get(task_id, [])
+            if queue in watchers:
+                watchers.remove(queue)
+            if not watchers:
+                self._watchers.pop(task_id, None)
+    
+    async def _forward_task_events(self, task_id: str, queue: asyncio.Queue) -> None:
+        """Relay Redis update events for a task into a status stream's queue"""
+        pubsub = self.async_redis_client.pubsub()
+        try:
+            await pubsub.subscribe(TASK_EVENTS_CHANNEL + task_id)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    queue.put_nowait(None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The stream keeps polling on STATUS_STREAM_POLL_INTERVAL without events
+            logger.warning(f"Task event subscription failed for {task_id}: {e}")
+        finally:
+            await pubsub.aclose()
+    
+    def _notify_watchers(self, task_id: str) -> None:
+        """Wake any status streams for a task; safe to call from worker threads"""
+        try:
+            self.redis_client.publish(TASK_EVENTS_CHANNEL + task_id, "updated")
+        except Exception as e:
+            logger.warning(f"Failed to publish task event for {task_id}: {e}")
+        
+        queues = self._watchers.get(task_id)
+        if not queues or self._loop is None or self._loop.is_closed():
+            return
+        
+        for queue in list(queues):
+            self._loop.call_soon_threadsafe(queue.put_nowait, None)
+    
     def _get_progress_message(self, task: ScanTask) -> str:
         """Generate user-friendly progress message based on task status and progress"""
         if task.status == ScanStatus.PENDING:
@@ -540,16 +730,18 @@ class SimpleParallelScanner:
     
     def get_all_tasks(self) -> List[Dict]:
         """Get all scan tasks"""
-        return [self.get_task_status(task_id) for task_id in self.tasks.keys()]
+        return [self._task_status(task) for task in self.tasks.values()]
     
     def get_worker_status(self) -> Dict:
         """Get worker pool status"""
+        # Tally every status in one pass over the task table
+        status_counts = Counter(task.status for task in self.tasks.values())
         return {
             "max_workers": self.max_workers,
-            "active_workers": len([t for t in self.tasks.values() if t.status == ScanStatus.RUNNING]),
-            "pending_tasks": len([t for t in self.tasks.values() if t.status == ScanStatus.PENDING]),
-            "completed_tasks": len([t for t in self.tasks.values() if t.status == ScanStatus.COMPLETED]),
-            "failed_tasks": len([t for t in self.tasks.values() if t.status == ScanStatus.FAILED])
+            "active_workers": status_counts[ScanStatus.RUNNING],
+            "pending_tasks": status_counts[ScanStatus.PENDING],
+            "completed_tasks": status_counts[ScanStatus.COMPLETED],
+            "failed_tasks": status_counts[ScanStatus.FAILED]
         }
     
     def shutdown(self):
@@ -2,6 +2,7 @@
 Supabase client for CodeClinic backend
 """
 
+import asyncio
 import os
 import logging
 from typing import List, Dict, Any, Optional
@@ -55,11 +56,24 @@ class SupabaseClient:
         """Check if Supabase client is available"""
         return self.client is not None
     
+    async def _execute(self, query):
+        """Run a query builder's blocking HTTP request in a worker thread so the event loop stays free"""
+        return await asyncio.to_thread(query.execute)
+    
+    async def update_user(self, user_id: str, update_data: Dict[str, Any]) -> bool:
+        """Update fields on an existing user"""
+        try:
+            result = await self._execute(self.client.table('users').update(update_data).eq('id', user_id))
+            return bool(result.data)
+        except Exception as e:
+            logger.error(f"Error updating user: {str(e)}")
+            return False
+    
     async def get_or_create_user(self, clerk_user_id: str, user_data: Dict[str, Any]) -> Optional[str]:
         """Get or create user and return user ID"""
         try:
             # First, try to find existing user
-            result = self.client.table('users').select('id').eq('clerk_user_id', clerk_user_id).execute()
+            result = await self._execute(self.client.table('users').select('id').eq('clerk_user_id', clerk_user_id))
             
             if result.data:
                 return result.data[0]['id']
@@ -73,7 +87,7 @@ class SupabaseClient:
                 'avatar_url': user_data.get('avatar_url')
             }
             
-            result = self.client.table('users').insert(user_record).execute()
+            result = await self._execute(self.client.table('users').insert(user_record))
             
             if result.data:
                 return result.data[0]['id']
@@ -91,7 +105,7 @@ class SupabaseClient:
             logger.info(f"Looking for existing user with Clerk ID: {clerk_user_id}")
             
             # First, try to get existing user
-            existing_user = self.client.table('users').select('id').eq('clerk_user_id', clerk_user_id).execute()
+            existing_user = await self._execute(self.client.table('users').select('id').eq('clerk_user_id', clerk_user_id))
             
             if existing_user.data:
                 user_id = existing_user.data[0]['id']
@@ -106,7 +120,7 @@ class SupabaseClient:
                     if avatar_url: update_data['avatar_url'] = avatar_url
                     
                     if update_data:
-                        update_result = self.client.table('users').update(update_data).eq('id', user_id).execute()
+                        update_result = await self._execute(self.client.table('users').update(update_data).eq('id', user_id))
                         if update_result.data:
                             logger.info(f"Updated user information for {user_id}: {update_data}")
                 
@@ -122,7 +136,7 @@ class SupabaseClient:
             }
             
             logger.info(f"Creating new user with data: {user_data}")
-            response = self.client.table('users').insert(user_data).execute()
+            response = await self._execute(self.client.table('users').insert(user_data))
             
             if response.data:
                 logger.info(f"Successfully created new user: {clerk_user_id} with DB ID: {response.data[0]['id']}")
@@ -138,7 +152,7 @@ class SupabaseClient:
     async def get_existing_scan(self, website_url: str, user_id: str) -> Optional[str]:
         """Get existing scan for user and website"""
         try:
-            result = self.client.table('website_scans').select('id').eq('website_url', website_url).eq('created_by', user_id).execute()
+            result = await self._execute(self.client.table('website_scans').select('id').eq('website_url', website_url).eq('created_by', user_id))
             
             if result.data:
                 return result.data[0]['id']
@@ -151,7 +165,7 @@ class SupabaseClient:
     async def save_website_scan(self, scan_data: Dict[str, Any]) -> Optional[str]:
         """Save website scan and return scan ID"""
         try:
-            result = self.client.table('website_scans').insert(scan_data).execute()
+            result = await self._execute(self.client.table('website_scans').insert(scan_data))
             
             if result.data:
                 return result.data[0]['id']
@@ -168,7 +182,7 @@ class SupabaseClient:
         try:
             # Get the created_by from the scan if not provided
             if not created_by:
-                scan_data = self.client.table('website_scans').select('created_by').eq('id', scan_id).execute()
+                scan_data = await self._execute(self.client.table('website_scans').select('created_by').eq('id', scan_id))
                 if scan_data.data:
                     created_by = scan_data.data[0].get('created_by')
             
@@ -191,7 +205,7 @@ class SupabaseClient:
                 }
                 question_records.append(question_record)
             
-            result = self.client.table('questions').insert(question_records).execute()
+            result = await self._execute(self.client.table('questions').insert(question_records))
             
             if result.data:
                 logger.info(f"Saved {len(question_records)} questions for scan {scan_id}")
@@ -224,7 +238,7 @@ class SupabaseClient:
                 }
                 guide_records.append(guide_record)
             
-            result = self.client.table('vulnerability_guides').insert(guide_records).execute()
+            result = await self._execute(self.client.table('vulnerability_guides').insert(guide_records))
             
             if result.data:
                 logger.info(f"Saved {len(guide_records)} guide entries for scan {scan_id}")
@@ -240,7 +254,7 @@ class SupabaseClient:
     async def save_quiz_attempt(self, attempt_data: Dict[str, Any]) -> Optional[str]:
         """Save quiz attempt and return attempt ID"""
         try:
-            result = self.client.table('quiz_attempts').insert(attempt_data).execute()
+            result = await self._execute(self.client.table('quiz_attempts').insert(attempt_data))
             
             if result.data:
                 return result.data[0]['id']
@@ -257,11 +271,11 @@ class SupabaseClient:
         try:
             # Get user_id from quiz_attempt if not provided
             if 'user_id' not in response_data and 'quiz_attempt_id' in response_data:
-                attempt_result = self.client.table('quiz_attempts').select('user_id').eq('id', response_data['quiz_attempt_id']).execute()
+                attempt_result = await self._execute(self.client.table('quiz_attempts').select('user_id').eq('id', response_data['quiz_attempt_id']))
                 if attempt_result.data:
                     response_data['user_id'] = attempt_result.data[0]['user_id']
             
-            result = self.client.table('question_responses').insert(response_data).execute()
+            result = await self._execute(self.client.table('question_responses').insert(response_data))
             
             if result.data:
                 logger.info(f"Saved question response: {result.data[0]['id']}")
@@ -274,6 +288,20 @@ class SupabaseClient:
             logger.error(f"Error saving question response: {str(e)}")
             return None
     
+    async def save_question_response_batch(self, response_records: List[Dict[str, Any]]) -> List[str]:
+        """Save several question responses in a single insert and return their IDs
+        
+        Database errors are raised to the caller so the endpoint can report their cause.
+        """
+        result = await self._execute(self.client.table('question_responses').insert(response_records))
+        
+        if result.data:
+            logger.info(f"Saved {len(result.data)} question responses")
+            return [row['id'] for row in result.data]
+        else:
+            logger.error(f"Failed to save question responses: {result}")
+            return []
+    
     async def save_question_responses(self, attempt_id: str, responses: List[Dict[str, Any]]) -> bool:
         """Save individual question responses"""
         try:
@@ -289,7 +317,7 @@ class SupabaseClient:
                 }
                 response_records.append(response_record)
             
-            result = self.client.table('question_responses').insert(response_records).execute()
+            result = await self._execute(self.client.table('question_responses').insert(response_records))
             
             if result.data:
                 logger.info(f"Saved {len(response_records)} question responses for attempt {attempt_id}")
@@ -317,15 +345,17 @@ class SupabaseClient:
                 users!website_scans_created_by_fkey(username, full_name)
             ''').eq('is_public', True).order('scan_date', desc=True).range(offset, offset + limit - 1)
             
-            scan_result = scan_query.execute()
+            scan_result = await self._execute(scan_query)
             scans = scan_result.data if scan_result.data else []
             
-            # For each scan, get question statistics
+            # Fetch question statistics for every scan concurrently
+            questions_results = await asyncio.gather(*(
+                self._execute(self.client.table('questions').select('difficulty, exercise_type').eq('website_scan_id', scan['id']))
+                for scan in scans
+            ))
+            
             result_scans = []
-            for scan in scans:
-                # Get questions for this scan
-                questions_query = self.client.table('questions').select('difficulty, exercise_type').eq('website_scan_id', scan['id'])
-                questions_result = questions_query.execute()
+            for scan, questions_result in zip(scans, questions_results):
                 questions = questions_result.data if questions_result.data else []
                 
                 # Extract user info
@@ -391,7 +421,7 @@ class SupabaseClient:
         """Get leaderboard data from user_stats table"""
         try:
             # Get user stats with user information
-            result = self.client.table('user_stats').select('''
+            result = await self._execute(self.client.table('user_stats').select('''
                 total_xp,
                 total_questions_answered,
                 total_correct_answers,
@@ -404,7 +434,7 @@ class SupabaseClient:
                     email,
                     avatar_url
                 )
-            ''').order('total_xp', desc=True).limit(limit).execute()
+            ''').order('total_xp', desc=True).limit(limit))
             
             if not result.data:
                 return []
@@ -439,7 +469,7 @@ class SupabaseClient:
         """Manually update user stats for a specific user"""
         try:
             # Calculate stats from question_responses
-            responses_result = self.client.table('question_responses').select('xp_earned, is_correct, badge').eq('user_id', user_id).execute()
+            responses_result = await self._execute(self.client.table('question_responses').select('xp_earned, is_correct, badge').eq('user_id', user_id))
             
             if not responses_result.data:
                 return True  # No responses to update
@@ -463,7 +493,7 @@ class SupabaseClient:
                 'updated_at': 'now()'
             }
             
-            result = self.client.table('user_stats').upsert(stats_data, on_conflict='user_id').execute()
+            result = await self._execute(self.client.table('user_stats').upsert(stats_data, on_conflict='user_id'))
             
             if result.data:
                 logger.info(f"Updated user stats for user {user_id}: {total_xp} XP, {correct_answers}/{total_questions} correct")
@@ -479,7 +509,7 @@ class SupabaseClient:
     async def get_scan_questions(self, scan_id: str) -> List[Dict[str, Any]]:
         """Get questions for a specific scan"""
         try:
-            result = self.client.table('questions').select('*').eq('website_scan_id', scan_id).execute()
+            result = await self._execute(self.client.table('questions').select('*').eq('website_scan_id', scan_id))
             return result.data if result.data else []
             
         except Exception as e:
@@ -489,7 +519,7 @@ class SupabaseClient:
     async def get_scan_guide(self, scan_id: str) -> List[Dict[str, Any]]:
         """Get vulnerability guide for a specific scan"""
         try:
-            result = self.client.table('vulnerability_guides').select('*').eq('website_scan_id', scan_id).execute()
+            result = await self._execute(self.client.table('vulnerability_guides').select('*').eq('website_scan_id', scan_id))
             return result.data if result.data else []
             
         except Exception as e:
@@ -499,13 +529,13 @@ class SupabaseClient:
     async def get_scan_info(self, scan_id: str) -> Dict[str, Any]:
         """Get scan information including website details"""
         try:
-            result = self.client.table('website_scans').select('''
+            result = await self._execute(self.client.table('website_scans').select('''
                 id,
                 website_url,
                 scan_date,
                 created_by,
                 users!website_scans_created_by_fkey(username, full_name)
-            ''').eq('id', scan_id).execute()
+            ''').eq('id', scan_id))
             
             if result.data and len(result.data) > 0:
                 scan = result.data[0]
@@ -10,6 +10,14 @@ from zapv2 import ZAPv2
 
 logger = logging.getLogger(__name__)
 
+# Map ZAP risk levels to our severity levels
+ZAP_RISK_SEVERITY = {
+    "High": "high",
+    "Medium": "medium",
+    "Low": "low",
+    "Informational": "informational"
+}
+
 class ZAPScanner:
     """ZAP scanner using the official Python API client"""
     
@@ -208,17 +216,10 @@ class ZAPScanner:
     def _process_alerts(self, alerts: List[Dict]) -> List[Dict]:
         """Process ZAP alerts into vulnerability format"""
         vulnerabilities = []
+        id_prefix = f"vuln_{int(time.time() * 1000)}_"
         
         for alert in alerts:
             try:
-                # Map ZAP risk levels to our severity levels
-                risk_mapping = {
-                    "High": "high",
-                    "Medium": "medium", 
-                    "Low": "low",
-                    "Informational": "informational"
-                }
-                
                 # Map ZAP alert names to vulnerability types
                 alert_name = alert.get("name", "").lower()
                 if "xss" in alert_name or "cross-site scripting" in alert_name:
@@ -237,9 +238,9 @@ class ZAPScanner:
                     vuln_type = "other"
                 
                 vuln = {
-                    "id": f"vuln_{int(time.time() * 1000)}_{len(vulnerabilities)}",
+                    "id": f"{id_prefix}{len(vulnerabilities)}",
                     "type": vuln_type,
-                    "severity": risk_mapping.get(alert.get("risk", "Low"), "low"),
+                    "severity": ZAP_RISK_SEVERITY.get(alert.get("risk", "Low"), "low"),
                     "title": alert.get("name", "Unknown Vulnerability"),
                     "description": alert.get("description", ""),
                     "url": alert.get("url", ""),
@@ -3,7 +3,7 @@
 import { useState } from 'react';
 import URLInputForm from '@/components/URLInputForm';
 import PageSelection from '@/components/PageSelection';
-import ScanProgress from '@/components/ScanProgress';
+import ScanProgress, { ScanStatusUpdate } from '@/components/ScanProgress';
 import VitalsDashboard from '@/components/VitalsDashboard';
 import LabResults from '@/components/LabResults';
 
@@ -19,6 +19,8 @@ export default function Home() {
   const [crawlId, setCrawlId] = useState<string | null>(null);
   const [scanId, setScanId] = useState<string | null>(null);
   const [discoveredPages, setDiscoveredPages] = useState<Page[]>([]);
+  // Latest status event, shared with ScanProgress so each scan needs only one stream
+  const [scanStatus, setScanStatus] = useState<ScanStatusUpdate | null>(null);
 
   const handleCrawlStart = async (url: string) => {
     try {
@@ -43,8 +45,8 @@ export default function Home() {
       const data = await response.json();
       setCrawlId(data.scan_id);
       
-      // Poll for crawl completion
-      pollCrawlStatus(data.scan_id);
+      // Follow crawl progress until it completes
+      followCrawlStatus(data.scan_id);
       
     } catch (error) {
       console.error('Error starting crawl:', error);
@@ -52,29 +54,39 @@ export default function Home() {
     }
   };
 
-  const pollCrawlStatus = async (crawlId: string) => {
-    const pollInterval = setInterval(async () => {
-      try {
-        const response = await fetch(`http://localhost:8000/scan/${crawlId}/status`);
-        const data = await response.json();
-        
-        if (data.status === 'completed') {
+  const followCrawlStatus = (crawlId: string) => {
+    setScanStatus(null);
+    const events = new EventSource(`http://localhost:8000/scan/${crawlId}/events`);
+
+    events.addEventListener('status', async (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      setScanStatus(data);
+
+      if (data.status === 'completed') {
+        events.close();
+        try {
           // Get discovered pages
           const pagesResponse = await fetch(`http://localhost:8000/crawl/${crawlId}/pages`);
           const pagesData = await pagesResponse.json();
           setDiscoveredPages(pagesData.pages || []);
           setWorkflowStep('page-selection');
-          clearInterval(pollInterval);
-        } else if (data.status === 'failed') {
+        } catch (error) {
+          console.error('Error fetching discovered pages:', error);
           setWorkflowStep('error');
-          clearInterval(pollInterval);
         }
-      } catch (error) {
-        console.error('Error polling crawl status:', error);
+      } else if (data.status === 'failed') {
+        events.close();
+        setWorkflowStep('error');
+      }
+    });
+
+    events.onerror = (error) => {
+      // EventSource reconnects by itself after a dropped connection; only a closed stream is fatal
+      if (events.readyState === EventSource.CLOSED) {
+        console.error('Error streaming crawl status:', error);
         setWorkflowStep('error');
-        clearInterval(pollInterval);
       }
-    }, 2000);
+    };
   };
 
   const handleScanAll = async () => {
@@ -103,8 +115,8 @@ export default function Home() {
       const data = await response.json();
       setScanId(data.scan_id);
       
-      // Poll for scan completion
-      pollScanStatus(data.scan_id);
+      // Follow scan progress until it completes
+      followScanStatus(data.scan_id);
       
     } catch (error) {
       console.error('Error starting scan:', error);
@@ -138,8 +150,8 @@ export default function Home() {
       const data = await response.json();
       setScanId(data.scan_id);
       
-      // Poll for scan completion
-      pollScanStatus(data.scan_id);
+      // Follow scan progress until it completes
+      followScanStatus(data.scan_id);
       
     } catch (error) {
       console.error('Error starting selected scan:', error);
@@ -147,26 +159,31 @@ export default function Home() {
     }
   };
 
-  const pollScanStatus = async (scanId: string) => {
-    const pollInterval = setInterval(async () => {
-      try {
-        const response = await fetch(`http://localhost:8000/scan/${scanId}/status`);
-        const data = await response.json();
-        
-        if (data.status === 'completed') {
-          setScanData(data);
-          setWorkflowStep('completed');
-          clearInterval(pollInterval);
-        } else if (data.status === 'failed') {
-          setWorkflowStep('error');
-          clearInterval(pollInterval);
-        }
-      } catch (error) {
-        console.error('Error polling scan status:', error);
+  const followScanStatus = (scanId: string) => {
+    setScanStatus(null);
+    const events = new EventSource(`http://localhost:8000/scan/${scanId}/events`);
+
+    events.addEventListener('status', (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      setScanStatus(data);
+
+      if (data.status === 'completed') {
+        events.close();
+        setScanData(data);
+        setWorkflowStep('completed');
+      } else if (data.status === 'failed') {
+        events.close();
+        setWorkflowStep('error');
+      }
+    });
+
+    events.onerror = (error) => {
+      // EventSource reconnects by itself after a dropped connection; only a closed stream is fatal
+      if (events.readyState === EventSource.CLOSED) {
+        console.error('Error streaming scan status:', error);
         setWorkflowStep('error');
-        clearInterval(pollInterval);
       }
-    }, 2000);
+    };
   };
 
   return (
@@ -190,7 +207,7 @@ export default function Home() {
         )}
 
         {workflowStep === 'crawling' && (
-          <ScanProgress scanId={crawlId} />
+          <ScanProgress update={scanStatus} />
         )}
 
         {workflowStep === 'page-selection' && (
@@ -202,7 +219,7 @@ export default function Home() {
         )}
 
         {workflowStep === 'scanning' && (
-          <ScanProgress scanId={scanId} />
+          <ScanProgress update={scanStatus} />
         )}
 
         {workflowStep === 'completed' && scanData && (
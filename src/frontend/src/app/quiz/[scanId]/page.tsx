@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import { useUser } from '@clerk/nextjs';
 import QuestionCard from '@/components/QuestionCard';
@@ -54,6 +54,10 @@ interface GameStats {
   timeStarted: number;
 }
 
+const SAVE_QUESTION_RESPONSES_URL = 'http://localhost:8000/save-question-responses';
+// Answers are saved in batches of this size, plus whatever is left when the page is left
+const QUESTION_RESPONSE_FLUSH_SIZE = 5;
+
 export default function QuizPage() {
   const params = useParams();
   const router = useRouter();
@@ -78,6 +82,8 @@ export default function QuizPage() {
   const [gameCompleted, setGameCompleted] = useState(false);
   const [questionResponses, setQuestionResponses] = useState<Map<string, any>>(new Map());
   const [quizAttemptId, setQuizAttemptId] = useState<string | null>(null);
+  // Question responses waiting to be saved in the next batch
+  const pendingResponses = useRef<any[]>([]);
 
   useEffect(() => {
     if (scanId) {
@@ -85,6 +91,15 @@ export default function QuizPage() {
     }
   }, [scanId]);
 
+  useEffect(() => {
+    // Save buffered answers when the tab is closed, refreshed or the user navigates away
+    window.addEventListener('pagehide', flushQuestionResponsesOnExit);
+    return () => {
+      window.removeEventListener('pagehide', flushQuestionResponsesOnExit);
+      flushQuestionResponsesOnExit();
+    };
+  }, []);
+
   const fetchQuizData = async () => {
     try {
       setLoading(true);
@@ -138,37 +153,79 @@ export default function QuizPage() {
     
     setQuestionResponses(prev => new Map(prev.set(questionId, response)));
 
-    // Save individual question response to database
+    // Buffer the response; answers are saved in small batches rather than one request each
     if (user && quizAttemptId) {
-      try {
-        await fetch('http://localhost:8000/save-question-response', {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            quiz_attempt_id: quizAttemptId,
-            question_id: questionId,
-            user_answer: response,
-            is_correct: isCorrect,
-            xp_earned: xpEarned,
-            time_taken: Math.floor(timeTaken),
-            user_id: user.id
-          })
-        });
-        console.log(`✅ Question response saved for question ${questionId}`);
-      } catch (err) {
-        console.error('Failed to save question response:', err);
+      pendingResponses.current.push({
+        quiz_attempt_id: quizAttemptId,
+        question_id: questionId,
+        user_answer: response,
+        is_correct: isCorrect,
+        xp_earned: xpEarned,
+        time_taken: Math.floor(timeTaken),
+        user_id: user.id
+      });
+      if (pendingResponses.current.length >= QUESTION_RESPONSE_FLUSH_SIZE) {
+        flushQuestionResponses();
       }
     }
   };
 
+  const flushQuestionResponses = async () => {
+    const responses = pendingResponses.current;
+    if (responses.length === 0) return;
+    pendingResponses.current = [];
+
+    try {
+      const response = await fetch(SAVE_QUESTION_RESPONSES_URL, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ responses })
+      });
+
+      if (!response.ok) {
+        throw new Error(`Failed to save question responses: ${response.statusText}`);
+      }
+      console.log(`✅ Saved ${responses.length} question responses`);
+    } catch (err) {
+      // Keep the answers so the next flush retries them
+      pendingResponses.current = [...responses, ...pendingResponses.current];
+      console.error('Failed to save question responses:', err);
+    }
+  };
+
+  const flushQuestionResponsesOnExit = () => {
+    const responses = pendingResponses.current;
+    if (responses.length === 0) return;
+
+    try {
+      // keepalive lets the request finish after the page is gone, unlike a regular fetch
+      fetch(SAVE_QUESTION_RESPONSES_URL, {
+        method: 'POST',
+        keepalive: true,
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ responses })
+      }).catch((err) => {
+        // Keep the answers in case the page is restored from the back/forward cache
+        pendingResponses.current = [...responses, ...pendingResponses.current];
+        console.error('Failed to save question responses:', err);
+      });
+      pendingResponses.current = [];
+    } catch (err) {
+      console.error('Failed to save question responses:', err);
+    }
+  };
+
   const goToNextQuestion = () => {
     if (currentQuestionIndex < questions.length - 1) {
       setCurrentQuestionIndex(prev => prev + 1);
     } else {
       // Quiz completed
       setGameCompleted(true);
+      flushQuestionResponses();
       saveQuizAttempt();
     }
   };
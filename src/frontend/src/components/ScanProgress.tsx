@@ -1,17 +1,17 @@
 "use client";
 
-import { useState, useEffect } from 'react';
+// Latest event from the scan's status stream, which the parent page owns
+export interface ScanStatusUpdate {
+  progress?: number;
+  status?: string;
+  message?: string;
+}
 
 interface ScanProgressProps {
-  scanId: string | null;
+  update: ScanStatusUpdate | null;
 }
 
-export default function ScanProgress({ scanId }: ScanProgressProps) {
-  const [progress, setProgress] = useState(0);
-  const [status, setStatus] = useState('Initializing scan...');
-  const [message, setMessage] = useState('Preparing security assessment...');
-  const [currentStep, setCurrentStep] = useState(0);
-
+export default function ScanProgress({ update }: ScanProgressProps) {
   const steps = [
     { name: 'Initializing', description: 'Setting up the security assessment' },
     { name: 'Discovering Pages', description: 'Crawling the website to find all pages' },
@@ -20,35 +20,11 @@ export default function ScanProgress({ scanId }: ScanProgressProps) {
     { name: 'Generating Report', description: 'Creating your personalized security health report' }
   ];
 
-  useEffect(() => {
-    if (!scanId) return;
-
-    const pollStatus = async () => {
-      try {
-        const response = await fetch(`http://localhost:8000/scan/${scanId}/status`);
-        const data = await response.json();
-        
-        setProgress(data.progress || 0);
-        setStatus(data.status || 'Scanning...');
-        setMessage(data.message || 'Processing...');
-        
-        // Update current step based on progress and scan type
-        const stepIndex = Math.floor((data.progress || 0) / 20);
-        setCurrentStep(Math.min(stepIndex, steps.length - 1));
-        
-      } catch (error) {
-        console.error('Error polling scan status:', error);
-      }
-    };
-
-    // Poll every 2 seconds
-    const interval = setInterval(pollStatus, 2000);
-    
-    // Initial poll
-    pollStatus();
+  const progress = update?.progress || 0;
+  const message = update ? (update.message || 'Processing...') : 'Preparing security assessment...';
 
-    return () => clearInterval(interval);
-  }, [scanId]);
+  // Each step covers 20% of the progress bar
+  const currentStep = Math.min(Math.floor(progress / 20), steps.length - 1);
 
   return (
     <div className="max-w-4xl mx-auto">